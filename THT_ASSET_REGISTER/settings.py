@@ -87,6 +87,16 @@ DATABASES = {
     )
 }
 
+# SQLite: background export/import threads write while requests save their
+# sessions (SESSION_SAVE_EVERY_REQUEST). Take the write lock when a
+# transaction begins rather than upgrading a read lock mid-transaction,
+# which fails at once with "database is locked", and wait for it instead.
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 20,
+    })
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -151,6 +161,65 @@ SESSION_COOKIE_AGE = 86400  # 24 hours in seconds
 SESSION_SAVE_EVERY_REQUEST = True
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 
+# ============================================
+# ASSET LIST SETTINGS
+# ============================================
+
+# "page" uses numbered pages; "cursor" uses keyset paging (constant cost per page)
+ASSET_LIST_PAGINATION = os.environ.get('ASSET_LIST_PAGINATION', 'page')
+
+# Dotted path to a search backend class; empty picks one from the database vendor
+ASSET_SEARCH_BACKEND = os.environ.get('ASSET_SEARCH_BACKEND') or None
+
+# Seconds between checks of the shared reference-data version (statuses,
+# device types, locations, departments are cached in each worker process)
+REFERENCE_DATA_CHECK_INTERVAL = int(os.environ.get('REFERENCE_DATA_CHECK_INTERVAL', 5))
+
+# Paginated lists count exactly up to this many rows; beyond it they show a
+# planner estimate (PostgreSQL) or a count cached until the table changes
+PAGINATOR_EXACT_COUNT_LIMIT = int(os.environ.get('PAGINATOR_EXACT_COUNT_LIMIT', 1000))
+PAGINATOR_COUNT_CACHE_TIMEOUT = 600
+
+# Filter dropdown counts are cached per filter combination until assets change
+FACET_CACHE_TIMEOUT = 600
+
+# Rendered asset list rows/pagination, keyed by query string, role and data version
+LIST_CACHE_TIMEOUT = int(os.environ.get('LIST_CACHE_TIMEOUT', 300))
+
+# Rows fetched per round trip when streaming exports
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))
+
+# Rows per Parquet row group / Arrow record batch (needs the optional pyarrow)
+EXPORT_COLUMNAR_BATCH_SIZE = 50000
+
+# Background exports: gzip files written to EXPORT_ROOT and downloaded through
+# the export_job_download view. EXPORT_JOB_RUNNER is "thread" (run in the web
+# process) or "worker" (run by manage.py run_export_jobs). A running job that
+# has not reported progress for EXPORT_STALL_SECONDS is marked failed.
+EXPORT_ROOT = os.environ.get('EXPORT_ROOT', os.path.join(BASE_DIR, 'exports'))
+EXPORT_JOB_RUNNER = os.environ.get('EXPORT_JOB_RUNNER', 'thread')
+EXPORT_PROGRESS_INTERVAL = 5000
+EXPORT_STALL_SECONDS = int(os.environ.get('EXPORT_STALL_SECONDS', 300))
+EXPORT_RETENTION_HOURS = int(os.environ.get('EXPORT_RETENTION_HOURS', 24))
+
+# CSV import: rows validated per serial-number lookup, rows per bulk insert
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 500))
+
+# Background imports: uploads are kept in IMPORT_ROOT and imported chunk by
+# chunk (one transaction per IMPORT_CHUNK_SIZE rows) by a thread or by
+# manage.py run_import_jobs. A running job whose last commit is older than
+# IMPORT_STALL_SECONDS is resumed by the next worker.
+IMPORT_ROOT = os.environ.get('IMPORT_ROOT', os.path.join(BASE_DIR, 'imports'))
+IMPORT_JOB_RUNNER = os.environ.get('IMPORT_JOB_RUNNER', EXPORT_JOB_RUNNER)
+IMPORT_STALL_SECONDS = int(os.environ.get('IMPORT_STALL_SECONDS', 300))
+
+# Audit archival: manage.py archive_audit_log (run it from cron) moves
+# AuditLog rows older than AUDIT_ARCHIVE_AFTER_DAYS to AuditLogArchive,
+# AUDIT_ARCHIVE_BATCH_SIZE rows per transaction
+AUDIT_ARCHIVE_AFTER_DAYS = int(os.environ.get('AUDIT_ARCHIVE_AFTER_DAYS', 365))
+AUDIT_ARCHIVE_BATCH_SIZE = int(os.environ.get('AUDIT_ARCHIVE_BATCH_SIZE', 5000))
+
 # WhiteNoise configuration
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
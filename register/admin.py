@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Department, DeviceType, DeviceStatus, Location, Asset, UserProfile
+from .models import Department, DeviceType, DeviceStatus, Location, Asset, UserProfile, ExportJob, ImportBatch, RegisterCheckpoint
 
 # Register your models here.
 admin.site.register(Department)
@@ -18,3 +18,20 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter = ("role", "department")
     search_fields = ("user__username", "user__email", "user__first_name", "user__last_name")
     readonly_fields = ("created_at", "updated_at")
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "rows_written", "requested_by", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+    readonly_fields = ("created_at", "started_at", "finished_at")
+
+@admin.register(ImportBatch)
+class ImportBatchAdmin(admin.ModelAdmin):
+    list_display = ("id", "file_name", "status", "upsert", "rows_processed", "imported_rows", "updated_rows", "error_rows", "created_by", "created_at")
+    list_filter = ("status", "upsert")
+    readonly_fields = ("created_at", "started_at", "heartbeat_at", "imported_at", "finished_at")
+
+@admin.register(RegisterCheckpoint)
+class RegisterCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("id", "started_at", "taken_at", "asset_count")
+    readonly_fields = ("started_at", "taken_at", "asset_count")
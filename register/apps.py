@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class RegisterConfig(AppConfig):
     name = "register"
+
+    def ready(self):
+        # Connect signal receivers
+        from . import reference_data, signals, utils_search  # noqa: F401
@@ -2,6 +2,8 @@ from functools import wraps
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import condition
+from .utils_cache import data_validators
 
 
 def role_required(*roles):
@@ -157,3 +159,24 @@ def can_view_audit(view_func):
             messages.error(request, "You don't have permission to view audit logs.")
             return redirect('asset_list')
     return wrapper
+
+
+def conditional_on_data(*keys, daily=False):
+    """
+    Conditional GET support for views whose output only changes when the
+    data behind the given DataVersion keys does.
+    Usage: @conditional_on_data('assets', 'reference')
+
+    A matching If-None-Match / If-Modified-Since gets a 304 before the view
+    runs, so nothing is recomputed or serialized.
+    """
+    def validators(request):
+        cache_attr = f"_data_validators_{'_'.join(keys)}_{daily}"
+        if not hasattr(request, cache_attr):
+            setattr(request, cache_attr, data_validators(keys, daily=daily))
+        return getattr(request, cache_attr)
+
+    return condition(
+        etag_func=lambda request, *args, **kwargs: validators(request)[0],
+        last_modified_func=lambda request, *args, **kwargs: validators(request)[1],
+    )
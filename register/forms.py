@@ -1,5 +1,56 @@
 from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
 from .models import Asset
+from .reference_data import reference
+
+
+class ReferenceChoiceIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in self.field.reference_objects():
+            yield self.choice(obj)
+
+    def __len__(self):
+        extra = 1 if self.field.empty_label is not None else 0
+        return len(self.field.reference_objects()) + extra
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.reference_objects())
+
+
+class ReferenceChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField for the reference tables, with choices and validation
+    served from the in-process registry instead of a query per render.
+    """
+    iterator = ReferenceChoiceIterator
+    excluded_names = ()
+
+    def is_excluded(self, obj):
+        return obj.name.lower() in {name.lower() for name in self.excluded_names}
+
+    def reference_objects(self):
+        table = reference.table_for(self.queryset.model)
+        return [obj for obj in table.all() if not self.is_excluded(obj)]
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+
+        obj = reference.table_for(self.queryset.model).get(value)
+        if obj is None or self.is_excluded(obj):
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+        return obj
+
 
 class AssetForm(forms.ModelForm):
     # Enhanced staff_name field with autocomplete
@@ -27,6 +78,12 @@ class AssetForm(forms.ModelForm):
             "department",
             "staff_name",
         ]
+        field_classes = {
+            "device_type": ReferenceChoiceField,
+            "status": ReferenceChoiceField,
+            "location": ReferenceChoiceField,
+            "department": ReferenceChoiceField,
+        }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -37,9 +94,7 @@ class AssetForm(forms.ModelForm):
 
         # Optional: prevent new asset from being created with decommissioned status
         if not self.instance.pk:
-            self.fields["status"].queryset = (
-                self.fields["status"].queryset.exclude(name="decommissioned")
-            )
+            self.fields["status"].excluded_names = ("decommissioned",)
         
         # Add CSS classes to all fields
         for field_name, field in self.fields.items():
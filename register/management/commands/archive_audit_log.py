@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from register.utils_audit import archive_audit_log, archive_cutoff
+
+
+class Command(BaseCommand):
+    help = "Move audit log entries older than AUDIT_ARCHIVE_AFTER_DAYS to the archive table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Archive entries older than this many days (default: AUDIT_ARCHIVE_AFTER_DAYS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "AUDIT_ARCHIVE_BATCH_SIZE", 5000),
+            help="Rows moved per transaction",
+        )
+
+    def handle(self, *args, **options):
+        before = archive_cutoff(options["days"])
+        moved = archive_audit_log(before, options["batch_size"])
+
+        self.stdout.write(f"Archived {moved} audit log entries older than {before:%Y-%m-%d %H:%M}")
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from register.utils_history import prune_checkpoints, take_checkpoint
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the current register into a checkpoint that point-in-time "
+        "reconstruction replays from (run periodically, e.g. nightly from cron)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=None,
+            help="Keep only this many of the newest checkpoints (default: keep all)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=getattr(settings, "EXPORT_CHUNK_SIZE", 2000),
+            help="Assets copied per query",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = take_checkpoint(options["chunk_size"])
+        self.stdout.write(
+            f"Checkpoint #{checkpoint.pk}: {checkpoint.asset_count} assets at {checkpoint.taken_at:%Y-%m-%d %H:%M}"
+        )
+
+        if options["keep"]:
+            deleted = prune_checkpoints(options["keep"])
+            if deleted:
+                self.stdout.write(f"Deleted {deleted} old checkpoint rows")
@@ -0,0 +1,159 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from register.models import Asset, AuditLog
+from register.reference_data import reference
+
+
+# Plan fragments that mean "an index answered this" / "the whole table was read"
+INDEX_PATTERNS = {
+    "postgresql": re.compile(r"(Index Scan|Index Only Scan|Bitmap Index Scan) (?:Backward )?(?:using|on) (\w+)"),
+    "sqlite": re.compile(r"USING (?:COVERING )?INDEX (\w+)|USING (INTEGER PRIMARY KEY)"),
+}
+FULL_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    "sqlite": re.compile(r"\bSCAN (\w+)\b(?! USING)"),
+}
+
+
+def canonical_queries():
+    """
+    The hot queries issued by views.py and utils_dashboard.py, as
+    (name, queryset, full_read) tuples. full_read marks queries that read
+    every matching row by design (exports), where a table scan is expected.
+    Keep this list in step with the views.
+    """
+    decommissioned = reference.decommissioned_status()
+    status_id = decommissioned.pk if decommissioned else 0
+
+    assets = Asset.objects.select_related("status", "device_type", "department", "location")
+    active = assets.filter(is_active=True)
+    # Aware midnight on the 1st; a bare date would be compared as a naive datetime
+    first_day_of_month = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    week_ago = timezone.now() - timedelta(days=7)
+    audit = AuditLog.objects.select_related("asset", "user")
+    month_ago = timezone.now() - timedelta(days=30)
+
+    def breakdown(queryset, field):
+        return queryset.values(field).annotate(count=Count("id")).order_by("-count")
+
+    return [
+        ("asset_list", active.order_by("-id")[:10], False),
+        ("asset_list_by_updated", active.order_by("-updated_at", "-id")[:10], False),
+        ("asset_list_by_name", active.order_by("device_name", "id")[:10], False),
+        ("asset_list_by_serial", active.order_by("serial_number", "id")[:10], False),
+        ("asset_list_status_filter", assets.filter(status_id=status_id).order_by("-id")[:10], False),
+        ("asset_serial_lookup", Asset.objects.filter(serial_number="SN-0000"), False),
+        ("decommissioned_list", assets.filter(is_active=False).order_by("-id")[:10], False),
+        ("export_active", active.order_by("-id"), True),
+        ("dashboard_status_breakdown", breakdown(active, "status__name"), False),
+        ("dashboard_device_type_breakdown", breakdown(active, "device_type__name"), False),
+        ("dashboard_department_breakdown", breakdown(active, "department__name"), False),
+        ("dashboard_location_breakdown", breakdown(active, "location__name"), False),
+        ("dashboard_created_this_month",
+         active.filter(created_at__gte=first_day_of_month).values("id"), False),
+        ("dashboard_updated_this_week",
+         active.filter(updated_at__gte=week_ago).values("id"), False),
+        ("trend_created",
+         Asset.objects.filter(created_at__gte=month_ago)
+         .annotate(date=TruncDate("created_at"))
+         .values("date").annotate(count=Count("id")), False),
+        ("recent_activity",
+         AuditLog.objects.select_related("asset", "user").order_by("-timestamp")[:10], False),
+        ("audit_list", audit.order_by("-timestamp", "-id")[:20], False),
+        ("audit_list_by_asset", audit.filter(asset_id=1).order_by("-timestamp", "-id")[:20], False),
+        ("audit_list_by_user", audit.filter(user_id=1).order_by("-timestamp", "-id")[:20], False),
+        ("audit_list_by_action",
+         audit.filter(action="updated").order_by("-timestamp", "-id")[:20], False),
+    ]
+
+
+def analyse_plan(vendor, plan):
+    """
+    Return (indexes used, tables fully scanned) for an EXPLAIN output
+    """
+    indexes = []
+    for match in INDEX_PATTERNS[vendor].finditer(plan):
+        indexes.append(next(group for group in match.groups() if group))
+
+    scanned = [
+        table for table in FULL_SCAN_PATTERNS[vendor].findall(plan)
+        if table.startswith("register_")
+    ]
+    return indexes, scanned
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on the canonical asset/audit queries and report index usage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--plans",
+            action="store_true",
+            help="Print the full plan for each query",
+        )
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit with an error if any query scans a register table without an index",
+        )
+        parser.add_argument(
+            "--force-index",
+            action="store_true",
+            help="PostgreSQL only: disable sequential scans while explaining, so small "
+                 "development tables report whether an index *can* serve each query",
+        )
+        parser.add_argument(
+            "--only",
+            nargs="*",
+            help="Limit the report to these query names",
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in INDEX_PATTERNS:
+            raise CommandError(f"EXPLAIN analysis is not supported for '{vendor}'")
+
+        queries = canonical_queries()
+        if options["only"]:
+            queries = [q for q in queries if q[0] in options["only"]]
+
+        regressions = []
+
+        with transaction.atomic():
+            if options["force_index"] and vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for name, queryset, full_read in queries:
+                plan = queryset.explain()
+                indexes, scanned = analyse_plan(vendor, plan)
+
+                if scanned and full_read:
+                    line = f"FULL READ {name}: {', '.join(scanned)} (expected)"
+                elif scanned:
+                    regressions.append(name)
+                    line = self.style.ERROR(f"SEQ SCAN  {name}: {', '.join(scanned)}")
+                elif indexes:
+                    line = self.style.SUCCESS(f"INDEX     {name}: {', '.join(dict.fromkeys(indexes))}")
+                else:
+                    line = self.style.WARNING(f"NO TABLE  {name}")
+
+                self.stdout.write(line)
+
+                if options["plans"]:
+                    self.stdout.write(plan)
+                    self.stdout.write("")
+
+        self.stdout.write(
+            f"\n{len(regressions)} of {len(queries)} queries scan a table without an index"
+        )
+
+        if regressions and options["fail_on_seq_scan"]:
+            raise CommandError(f"Sequential scans in: {', '.join(regressions)}")
@@ -0,0 +1,184 @@
+import csv
+import multiprocessing
+import os
+import pickle
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from register.utils_audit import buffered_audit
+from register.utils_import import (
+    clean_row,
+    create_assets,
+    missing_headers,
+    reference_maps,
+    serial_checks,
+    serial_errors,
+    upsert_assets,
+)
+from register.utils_import_pool import init_worker, validate_chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Import assets from CSV files on disk, validating chunks in parallel "
+        "and writing them from this process in batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="CSV files in the export/import format")
+        parser.add_argument(
+            "--user",
+            help="Username recorded on the audit entries",
+        )
+        parser.add_argument(
+            "--upsert",
+            action="store_true",
+            help="Update assets whose serial number is already registered",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Validation processes (default: one per CPU)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=getattr(settings, "IMPORT_CHUNK_SIZE", 1000),
+            help="Rows per validation chunk and per write transaction",
+        )
+        parser.add_argument(
+            "--errors",
+            default="import_errors.csv",
+            help="File the rejected rows and their errors are written to",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate only; write nothing but the error file",
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            user = User.objects.filter(username=options["user"]).first()
+            if user is None:
+                raise CommandError(f"No user named '{options['user']}'")
+
+        self.maps = reference_maps()
+        self.options = options
+        self.user = user
+
+        workers = options["workers"] or os.cpu_count() or 1
+        # Chunks validated ahead of the writer
+        self.window = workers * 2
+
+        # Spawned (not forked) workers share no database connections; each
+        # receives the reference maps once, not with every chunk
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(pickle.dumps(self.maps),),
+        )
+
+        with open(options["errors"], "w", newline="", encoding="utf-8") as error_file, pool:
+            errors = csv.writer(error_file)
+            errors.writerow(["File", "Row", "Serial Number", "Errors"])
+
+            totals = {"rows": 0, "created": 0, "updated": 0, "errors": 0}
+            started = time.monotonic()
+
+            for path in options["files"]:
+                self.import_file(path, pool, errors, totals, started)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['rows']} rows in {elapsed:.1f}s ({totals['rows'] / max(elapsed, 1e-6):.0f} rows/s): "
+            f"{totals['created']} created, {totals['updated']} updated, {totals['errors']} rejected"
+            + (" (dry run)" if options["dry_run"] else "")
+        ))
+        if totals["errors"]:
+            self.stdout.write(f"Row errors written to {options['errors']}")
+
+    def import_file(self, path, pool, errors, totals, started):
+        chunk_size = self.options["chunk_size"]
+
+        try:
+            source = open(path, newline="", encoding="utf-8-sig")
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        with source:
+            reader = csv.DictReader(source)
+
+            missing = missing_headers(reader.fieldnames)
+            if missing:
+                raise CommandError(f"{path}: missing required columns: {', '.join(sorted(missing))}")
+
+            rows = enumerate(reader, start=2)
+            self.first_seen = {}
+            pending = deque()
+
+            try:
+                while True:
+                    chunk = [(number, clean_row(row)) for number, row in islice(rows, chunk_size)]
+
+                    if chunk:
+                        pending.append(pool.submit(validate_chunk, chunk))
+
+                    if not pending:
+                        break
+
+                    if len(pending) >= self.window or not chunk:
+                        self.write_chunk(path, pending.popleft().result(), errors, totals, started)
+
+            except UnicodeDecodeError:
+                raise CommandError(f"{path} must be UTF-8 encoded")
+
+    def write_chunk(self, path, results, errors, totals, started):
+        """
+        The single writer: one transaction per chunk with batched inserts
+        (or updates) and batched audit entries.
+
+        The serial checks (one query per chunk) run here, in write order,
+        so they see every earlier chunk's writes and each serial's first
+        row; the pool has only checked the references.
+        """
+        checks = serial_checks(
+            [(number, values) for number, values, _ in results], self.first_seen, self.options["upsert"]
+        )
+        results = [
+            (number, values, serial_errors(values["serial_number"], **row_checks) + row_errors)
+            for (number, values, row_errors), row_checks in zip(results, checks)
+        ]
+        valid = [values for _, values, row_errors in results if not row_errors]
+
+        for number, values, row_errors in results:
+            if row_errors:
+                errors.writerow([path, number, values["serial_number"], "; ".join(row_errors)])
+
+        if valid and not self.options["dry_run"]:
+            with buffered_audit():
+                if self.options["upsert"]:
+                    created, updated = upsert_assets(valid, self.user, self.maps)
+                else:
+                    created, updated = create_assets(valid, self.user, self.maps), 0
+
+            totals["created"] += created
+            totals["updated"] += updated
+
+        totals["rows"] += len(results)
+        totals["errors"] += len(results) - len(valid)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"{path}: {totals['rows']} rows, {totals['errors']} rejected "
+            f"({totals['rows'] / max(elapsed, 1e-6):.0f} rows/s)"
+        )
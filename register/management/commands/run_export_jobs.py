@@ -0,0 +1,11 @@
+from register.utils_exports import purge_expired_exports, run_queued_export_jobs
+from register.utils_jobs import JobWorkerCommand
+
+
+class Command(JobWorkerCommand):
+    help = "Run queued background exports (for EXPORT_JOB_RUNNER = 'worker')"
+
+    def run_jobs(self):
+        ran = run_queued_export_jobs()
+        purged = purge_expired_exports()
+        return f"Ran {ran} export job(s), purged {purged} expired" if ran or purged else ""
@@ -0,0 +1,10 @@
+from register.utils_import import run_queued_import_jobs
+from register.utils_jobs import JobWorkerCommand
+
+
+class Command(JobWorkerCommand):
+    help = "Run queued and resume stalled background imports (for IMPORT_JOB_RUNNER = 'worker')"
+
+    def run_jobs(self):
+        ran = run_queued_import_jobs()
+        return f"Ran {ran} import job(s)" if ran else ""
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-17 01:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0019_alter_devicestatus_name"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                fields=["updated_at", "id"], name="asset_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(fields=["device_name", "id"], name="asset_name_id_idx"),
+        ),
+    ]
@@ -0,0 +1,76 @@
+from django.db import OperationalError, migrations
+
+# PostgreSQL: trigram GIN indexes over the exact expression Django's
+# icontains lookup compiles to, i.e. UPPER("col"::text).
+PG_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS asset_serial_trgm_idx ON register_asset "
+    "USING gin (UPPER(serial_number::text) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS asset_staff_trgm_idx ON register_asset "
+    "USING gin (UPPER(staff_name::text) gin_trgm_ops)",
+]
+
+PG_BACKWARD = [
+    "DROP INDEX IF EXISTS asset_serial_trgm_idx",
+    "DROP INDEX IF EXISTS asset_staff_trgm_idx",
+]
+
+# SQLite: FTS5 shadow table with the trigram tokenizer (SQLite 3.34+),
+# kept in sync by the signals in register.utils_search.
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS register_asset_search "
+    "USING fts5(serial_number, staff_name, tokenize='trigram')",
+    "INSERT INTO register_asset_search (rowid, serial_number, staff_name) "
+    "SELECT id, serial_number, staff_name FROM register_asset",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS register_asset_search",
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+
+    if connection.vendor == "postgresql":
+        statements = PG_FORWARD
+    elif connection.vendor == "sqlite":
+        statements = SQLITE_FORWARD
+    else:
+        return
+
+    with connection.cursor() as cursor:
+        try:
+            for sql in statements:
+                cursor.execute(sql)
+        except OperationalError:
+            # SQLite built without FTS5/trigram: searches fall back to
+            # plain icontains, which returns the same results.
+            if connection.vendor != "sqlite":
+                raise
+
+
+def drop_search_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+
+    if connection.vendor == "postgresql":
+        statements = PG_BACKWARD
+    elif connection.vendor == "sqlite":
+        statements = SQLITE_BACKWARD
+    else:
+        return
+
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0020_asset_sort_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0 on 2026-10-17 01:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0022_dataversion"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                fields=["status", "created_at"], name="asset_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                fields=["status", "updated_at"], name="asset_status_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                fields=["device_type", "status"], name="asset_type_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                fields=["department", "status"], name="asset_dept_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                fields=["location", "status"], name="asset_location_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(fields=["created_at"], name="asset_created_idx"),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 6.0 on 2026-10-17 02:00
+
+from django.db import migrations, models
+
+
+def populate_is_active(apps, schema_editor):
+    Asset = apps.get_model("register", "Asset")
+    Asset.objects.filter(status__name__iexact="decommissioned").update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0023_asset_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="is_active",
+            field=models.BooleanField(
+                default=True,
+                editable=False,
+                help_text="False once decommissioned; maintained from status on save",
+            ),
+        ),
+        migrations.RunPython(populate_is_active, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["id"],
+                name="asset_active_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["updated_at", "id"],
+                name="asset_active_updated_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["device_name", "id"],
+                name="asset_active_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["serial_number", "id"],
+                name="asset_active_serial_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["created_at"],
+                name="asset_active_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["status", "device_type", "department", "location"],
+                name="asset_active_facets_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["id"],
+                name="asset_retired_id_idx",
+            ),
+        ),
+    ]
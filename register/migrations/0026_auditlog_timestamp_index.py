@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-17 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0025_exportjob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["timestamp", "id"], name="auditlog_timestamp_id_idx"
+            ),
+        ),
+    ]
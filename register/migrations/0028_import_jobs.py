@@ -0,0 +1,73 @@
+# Generated by Django 6.0 on 2026-10-17 11:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0027_import_staging"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importbatch",
+            name="error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="importbatch",
+            name="finished_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="importbatch",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="importbatch",
+            name="rows_processed",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Background imports: CSV rows committed so far (the resume point)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="importbatch",
+            name="started_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="importbatch",
+            name="upload_name",
+            field=models.CharField(
+                blank=True,
+                help_text="Background imports: the uploaded file in IMPORT_ROOT",
+                max_length=255,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="importbatch",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("staged", "Staged"),
+                    ("queued", "Queued"),
+                    ("running", "Running"),
+                    ("imported", "Imported"),
+                    ("failed", "Failed"),
+                ],
+                default="staged",
+                max_length=10,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="importbatch",
+            index=models.Index(
+                fields=["status", "created_at"], name="importbatch_status_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-17 14:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0028_import_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importbatch",
+            name="updated_rows",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="importbatch",
+            name="upsert",
+            field=models.BooleanField(
+                default=False,
+                help_text="Update assets whose serial number is already registered instead of rejecting the row",
+            ),
+        ),
+        migrations.AddField(
+            model_name="importrow",
+            name="asset",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="register.asset",
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-17 16:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0029_import_upsert"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditLogArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("action", models.CharField(max_length=50)),
+                ("field_name", models.CharField(blank=True, max_length=100, null=True)),
+                ("old_value", models.TextField(blank=True, null=True)),
+                ("new_value", models.TextField(blank=True, null=True)),
+                ("timestamp", models.DateTimeField()),
+                ("archived_at", models.DateTimeField()),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_auditlog",
+                        to="register.asset",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived Audit Log",
+                "verbose_name_plural": "Archived Audit Logs",
+                "ordering": ["-timestamp"],
+                "indexes": [
+                    models.Index(
+                        fields=["asset", "timestamp"], name="auditarchive_asset_ts_idx"
+                    ),
+                    models.Index(
+                        fields=["timestamp", "id"], name="auditarchive_ts_id_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-17 18:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0030_auditlog_archive"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["asset", "timestamp", "id"], name="auditlog_asset_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["user", "timestamp", "id"], name="auditlog_user_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["action", "timestamp", "id"], name="auditlog_action_ts_idx"
+            ),
+        ),
+    ]
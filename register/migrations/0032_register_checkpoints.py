@@ -0,0 +1,86 @@
+# Generated by Django 6.0 on 2026-10-17 02:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0031_auditlog_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RegisterCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "taken_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the copy finished; unset while it is being written",
+                        null=True,
+                    ),
+                ),
+                ("asset_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Register Checkpoint",
+                "verbose_name_plural": "Register Checkpoints",
+                "ordering": ["-taken_at"],
+                "indexes": [
+                    models.Index(fields=["taken_at"], name="checkpoint_taken_at_idx")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="CheckpointAsset",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("asset_id", models.IntegerField()),
+                ("serial_number", models.CharField(max_length=100)),
+                ("created_at", models.DateTimeField()),
+                ("device_name", models.CharField(max_length=100)),
+                ("device_model", models.CharField(max_length=100)),
+                ("device_type", models.CharField(max_length=100)),
+                ("status", models.CharField(max_length=100)),
+                ("location", models.CharField(max_length=100)),
+                ("department", models.CharField(blank=True, max_length=100)),
+                ("staff_name", models.CharField(blank=True, max_length=255)),
+                (
+                    "checkpoint",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="assets",
+                        to="register.registercheckpoint",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("checkpoint", "asset_id"),
+                        name="checkpoint_asset_unique",
+                    )
+                ],
+            },
+        ),
+    ]
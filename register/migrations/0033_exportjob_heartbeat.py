@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-17 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0032_register_checkpoints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last progress report of the running worker",
+                null=True,
+            ),
+        ),
+    ]
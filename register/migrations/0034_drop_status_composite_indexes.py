@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-17 02:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0033_exportjob_heartbeat"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="asset",
+            name="asset_status_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="asset",
+            name="asset_status_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="asset",
+            name="asset_type_status_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="asset",
+            name="asset_dept_status_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="asset",
+            name="asset_location_status_idx",
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-17 02:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("register", "0034_drop_status_composite_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="auditlogarchive",
+            name="auditarchive_asset_ts_idx",
+        ),
+        migrations.AddIndex(
+            model_name="auditlogarchive",
+            index=models.Index(
+                fields=["asset", "timestamp", "id"], name="auditarchive_asset_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="auditlogarchive",
+            index=models.Index(
+                fields=["user", "timestamp", "id"], name="auditarchive_user_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="auditlogarchive",
+            index=models.Index(
+                fields=["action", "timestamp", "id"], name="auditarchive_action_ts_idx"
+            ),
+        ),
+    ]
@@ -52,6 +52,59 @@ class Location(models.Model):
 
 
 # ---------- Asset Model ----------
+def is_active_status(status_id):
+    """
+    False only for the decommissioned status
+    """
+    from .reference_data import reference
+
+    status = reference.statuses.get(status_id)
+    return not (status and status.name.lower() == DeviceStatus.STATUS_DECOMMISSIONED)
+
+
+class VersionedQuerySet(models.QuerySet):
+    """
+    Bumps the model's DataVersion on bulk writes, which send no post_save
+    """
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        self._data_changed()
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self._data_changed()
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        self._data_changed()
+        return rows
+
+    def _data_changed(self):
+        from .signals import version_key_for
+
+        DataVersion.bump_on_commit(version_key_for(self.model))
+
+
+class AssetQuerySet(VersionedQuerySet):
+    def active(self):
+        return self.filter(is_active=True)
+
+    def decommissioned(self):
+        return self.filter(is_active=False)
+
+    def update(self, **kwargs):
+        # Keep is_active in step with bulk status changes
+        status = kwargs.get("status", kwargs.get("status_id"))
+        if status is not None and "is_active" not in kwargs:
+            status_id = status.pk if isinstance(status, DeviceStatus) else status
+            if not hasattr(status_id, "resolve_expression"):
+                kwargs["is_active"] = is_active_status(status_id)
+        return super().update(**kwargs)
+
+
 class Asset(models.Model):
     device_name = models.CharField(max_length=100)
     device_model = models.CharField(max_length=100)
@@ -92,10 +145,76 @@ class Asset(models.Model):
         Location,
         on_delete=models.PROTECT
     )
+
+    is_active = models.BooleanField(
+        default=True,
+        editable=False,
+        help_text="False once decommissioned; maintained from status on save"
+    )
+
+    objects = AssetQuerySet.as_manager()
     
     def __str__(self):
         return f"{self.device_name} ({self.serial_number})"
 
+    def save(self, *args, **kwargs):
+        self.is_active = is_active_status(self.status_id)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "is_active"}
+
+        super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            # Sortable list columns (id is the keyset tiebreaker);
+            # serial_number is already covered by its unique index
+            models.Index(fields=["updated_at", "id"], name="asset_updated_id_idx"),
+            models.Index(fields=["device_name", "id"], name="asset_name_id_idx"),
+            # Creation trend (get_trend_data)
+            models.Index(fields=["created_at"], name="asset_created_idx"),
+            # Active rows only: lists, exports and counts never read
+            # decommissioned rows or join the status table
+            models.Index(
+                fields=["id"],
+                name="asset_active_id_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=["updated_at", "id"],
+                name="asset_active_updated_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=["device_name", "id"],
+                name="asset_active_name_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=["serial_number", "id"],
+                name="asset_active_serial_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=["created_at"],
+                name="asset_active_created_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # Covers dashboard breakdowns and list facet counts
+            models.Index(
+                fields=["status", "device_type", "department", "location"],
+                name="asset_active_facets_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # Decommissioned list, newest first
+            models.Index(
+                fields=["id"],
+                name="asset_retired_id_idx",
+                condition=models.Q(is_active=False),
+            ),
+        ]
+
     def clean(self):
         if not self.pk and self.status.name == "decommissioned":
             raise ValidationError(
@@ -115,11 +234,21 @@ class AuditLog(models.Model):
 
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    objects = VersionedQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.asset} - {self.action}"
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # History listings and keyset-iterated exports
+            models.Index(fields=["timestamp", "id"], name="auditlog_timestamp_id_idx"),
+            # Filtered audit listings, keyset-paged on (timestamp, id)
+            models.Index(fields=["asset", "timestamp", "id"], name="auditlog_asset_ts_idx"),
+            models.Index(fields=["user", "timestamp", "id"], name="auditlog_user_ts_idx"),
+            models.Index(fields=["action", "timestamp", "id"], name="auditlog_action_ts_idx"),
+        ]
 
 
 # ---------- User Profile ----------
@@ -219,3 +348,11 @@ def save_user_profile(sender, instance, **kwargs):
     if hasattr(instance, 'profile'):
         instance.profile.save()
 
+
+
+# Models defined in companion modules
+from .models_cache import DataVersion  # noqa: E402,F401
+from .models_exports import ExportJob  # noqa: E402,F401
+from .models_import import ImportBatch, ImportRow  # noqa: E402,F401
+from .models_audit import AuditLogArchive  # noqa: E402,F401
+from .models_checkpoint import CheckpointAsset, RegisterCheckpoint  # noqa: E402,F401
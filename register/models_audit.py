@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class AuditLogArchive(models.Model):
+    """
+    AuditLog rows older than AUDIT_ARCHIVE_AFTER_DAYS, moved here in
+    batches by manage.py archive_audit_log so the hot table stays small.
+    Rows keep their AuditLog id; asset_history reads both tables.
+    """
+    id = models.BigIntegerField(primary_key=True)
+
+    asset = models.ForeignKey("Asset", on_delete=models.CASCADE, related_name="archived_auditlog")
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+
+    action = models.CharField(max_length=50)
+    field_name = models.CharField(max_length=100, null=True, blank=True)
+    old_value = models.TextField(null=True, blank=True)
+    new_value = models.TextField(null=True, blank=True)
+
+    timestamp = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-timestamp"]
+        verbose_name = "Archived Audit Log"
+        verbose_name_plural = "Archived Audit Logs"
+        indexes = [
+            # Time-range reads, oldest first
+            models.Index(fields=["timestamp", "id"], name="auditarchive_ts_id_idx"),
+            # asset_history and filtered audit listings, keyset-paged on
+            # (timestamp, id) as on AuditLog
+            models.Index(fields=["asset", "timestamp", "id"], name="auditarchive_asset_ts_idx"),
+            models.Index(fields=["user", "timestamp", "id"], name="auditarchive_user_ts_idx"),
+            models.Index(fields=["action", "timestamp", "id"], name="auditarchive_action_ts_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.asset_id} - {self.action} (archived)"
@@ -0,0 +1,81 @@
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class _BumpVersion:
+    """
+    on_commit callback for DataVersion.bump_on_commit; equal callbacks
+    (same key) are registered once per transaction.
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+    def __eq__(self, other):
+        return isinstance(other, _BumpVersion) and other.key == self.key
+
+    def __call__(self):
+        DataVersion.bump(self.key)
+
+
+class DataVersion(models.Model):
+    """
+    Monotonic version counters shared by all worker processes.
+
+    A write bumps the counter for its key; each process compares the
+    counter it last saw with the stored one to know when its in-memory
+    copies are stale. Reading a version is a single primary-key lookup.
+    """
+    key = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Data Version"
+        verbose_name_plural = "Data Versions"
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+    @classmethod
+    def get_version(cls, key):
+        """
+        Current version for key (0 if it was never bumped)
+        """
+        return (
+            cls.objects.filter(key=key)
+            .values_list("version", flat=True)
+            .first()
+        ) or 0
+
+    @classmethod
+    def bump(cls, key):
+        """
+        Increment the version for key, creating the counter if needed
+        """
+        counters = cls.objects.filter(key=key)
+        changes = {"version": F("version") + 1, "updated_at": timezone.now()}
+
+        if not counters.update(**changes):
+            _, created = cls.objects.get_or_create(key=key, defaults={"version": 1})
+            if not created:
+                counters.update(**changes)
+
+    @classmethod
+    def bump_on_commit(cls, key):
+        """
+        Bump key once when the current transaction commits (immediately in
+        autocommit). Repeated calls inside one transaction, e.g. one per
+        imported row, still cost a single UPDATE; nothing is bumped if the
+        transaction rolls back.
+        """
+        callback = _BumpVersion(key)
+        connection = transaction.get_connection()
+
+        # Django drops callbacks of rolled-back savepoints from this list,
+        # so a pending equal callback means the bump is still scheduled.
+        if any(pending == callback for _, pending, *_ in connection.run_on_commit):
+            return
+
+        transaction.on_commit(callback)
@@ -0,0 +1,59 @@
+from django.db import models
+
+
+class RegisterCheckpoint(models.Model):
+    """
+    A full copy of the register (CheckpointAsset rows) taken by
+    manage.py checkpoint_register. Point-in-time reconstruction starts
+    from the first checkpoint after the requested date and undoes only
+    the audit entries in between, so its cost is bounded by the
+    checkpoint interval rather than by the length of the history.
+    """
+    started_at = models.DateTimeField(auto_now_add=True)
+    taken_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the copy finished; unset while it is being written"
+    )
+    asset_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-taken_at"]
+        verbose_name = "Register Checkpoint"
+        verbose_name_plural = "Register Checkpoints"
+        indexes = [
+            models.Index(fields=["taken_at"], name="checkpoint_taken_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"Checkpoint #{self.pk} ({self.taken_at or 'in progress'})"
+
+
+class CheckpointAsset(models.Model):
+    """
+    One asset as it stood at its checkpoint. Reference fields hold the
+    display text the audit log records (e.g. "In-Use"), so audit values
+    can be applied to them directly. asset_id is not a foreign key:
+    checkpoints outlive deleted assets.
+    """
+    checkpoint = models.ForeignKey(RegisterCheckpoint, on_delete=models.CASCADE, related_name="assets")
+    asset_id = models.IntegerField()
+
+    serial_number = models.CharField(max_length=100)
+    created_at = models.DateTimeField()
+
+    device_name = models.CharField(max_length=100)
+    device_model = models.CharField(max_length=100)
+    device_type = models.CharField(max_length=100)
+    status = models.CharField(max_length=100)
+    location = models.CharField(max_length=100)
+    department = models.CharField(max_length=100, blank=True)
+    staff_name = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["checkpoint", "asset_id"], name="checkpoint_asset_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.serial_number} at checkpoint #{self.checkpoint_id}"
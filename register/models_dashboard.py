@@ -110,10 +110,8 @@ class ADUser(models.Model):
     def get_assigned_assets_count(self):
         """Get number of assets assigned to this user"""
         from .models import Asset
-        return Asset.objects.filter(
+        return Asset.objects.active().filter(
             staff_name__icontains=self.username
-        ).exclude(
-            status__name__iexact='decommissioned'
         ).count()
 
 
@@ -148,7 +146,7 @@ class AssetMetrics(models.Model):
         """
         Generate metrics snapshot for a specific date
         """
-        from .models import Asset, DeviceStatus
+        from .models import Asset
         from collections import Counter
         
         # Get all assets (excluding decommissioned for most counts)
@@ -156,14 +154,10 @@ class AssetMetrics(models.Model):
             'status', 'device_type', 'department', 'location'
         ).all()
         
-        active_assets = all_assets.exclude(status__name__iexact='decommissioned')
+        active_assets = all_assets.filter(is_active=True)
         
         # Count by status
-        try:
-            decommissioned_status = DeviceStatus.objects.get(name__iexact='decommissioned')
-            decommissioned_count = all_assets.filter(status=decommissioned_status).count()
-        except DeviceStatus.DoesNotExist:
-            decommissioned_count = 0
+        decommissioned_count = all_assets.filter(is_active=False).count()
         
         # Department breakdown
         dept_counter = Counter(
@@ -0,0 +1,134 @@
+import os
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .models_jobs import BackgroundJob
+
+
+class ExportJob(BackgroundJob, models.Model):
+    """
+    A register export generated in the background.
+
+    The request only records what to export; a worker (a thread or the
+    run_export_jobs command, see EXPORT_JOB_RUNNER) writes the gzip file to
+    EXPORT_ROOT and keeps rows_written current. The file is downloaded
+    through the export_job_download view by the user who requested it.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    KIND_ASSETS = "assets"
+    KIND_DECOMMISSIONED = "decommissioned"
+
+    KIND_CHOICES = [
+        (KIND_ASSETS, "Active assets"),
+        (KIND_DECOMMISSIONED, "Decommissioned assets"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="List filters as {parameter: [values]}"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_QUEUED,
+    )
+    rows_written = models.PositiveIntegerField(default=0)
+    file_name = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="export_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last progress report of the running worker"
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Export Job"
+        verbose_name_plural = "Export Jobs"
+        indexes = [
+            # Worker polling for the oldest queued job
+            models.Index(fields=["status", "created_at"], name="exportjob_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} export #{self.pk} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        if not self.file_name:
+            stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+            self.file_name = f"{self.kind}-{stamp}-{secrets.token_urlsafe(16)}.csv.gz"
+        super().save(*args, **kwargs)
+
+    @property
+    def path(self):
+        return os.path.join(settings.EXPORT_ROOT, self.file_name)
+
+    @property
+    def download_url(self):
+        if self.status != self.STATUS_DONE:
+            return None
+        return reverse("export_job_download", args=[self.pk])
+
+    @classmethod
+    def claimable(cls):
+        """
+        Queued jobs; a stalled export is failed rather than resumed
+        """
+        return cls.objects.filter(status=cls.STATUS_QUEUED)
+
+    @classmethod
+    def stalled(cls):
+        """
+        Running jobs whose worker has not reported progress for
+        EXPORT_STALL_SECONDS (the thread or process running them died)
+        """
+        stalled_before = timezone.now() - timedelta(
+            seconds=getattr(settings, "EXPORT_STALL_SECONDS", 300)
+        )
+        return cls.objects.filter(status=cls.STATUS_RUNNING).filter(
+            Q(heartbeat_at__lt=stalled_before)
+            | Q(heartbeat_at__isnull=True, started_at__lt=stalled_before)
+        )
+
+    def as_dict(self):
+        return {
+            "id": self.pk,
+            "kind": self.kind,
+            "status": self.status,
+            "rows_written": self.rows_written,
+            "download_url": self.download_url,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
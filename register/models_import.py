@@ -0,0 +1,191 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from .models_jobs import BackgroundJob
+
+
+class ImportBatch(BackgroundJob, models.Model):
+    """
+    One uploaded CSV file.
+
+    Interactive imports stage every validated row in ImportRow until the
+    preview is confirmed, instead of keeping them in the session.
+    Background imports keep the upload in IMPORT_ROOT; a worker imports
+    it chunk by chunk, committing rows_processed with each chunk, so a
+    restarted job resumes after the last committed chunk. Only their
+    error rows are staged.
+    """
+    STATUS_STAGED = "staged"
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_IMPORTED = "imported"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_STAGED, "Staged"),
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_IMPORTED, "Imported"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    file_name = models.CharField(max_length=255, blank=True)
+    upload_name = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Background imports: the uploaded file in IMPORT_ROOT"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_STAGED,
+    )
+    upsert = models.BooleanField(
+        default=False,
+        help_text="Update assets whose serial number is already registered instead of rejecting the row"
+    )
+    valid_rows = models.PositiveIntegerField(default=0)
+    error_rows = models.PositiveIntegerField(default=0)
+    imported_rows = models.PositiveIntegerField(default=0)
+    updated_rows = models.PositiveIntegerField(default=0)
+    rows_processed = models.PositiveIntegerField(
+        default=0,
+        help_text="Background imports: CSV rows committed so far (the resume point)"
+    )
+    error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="import_batches",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    imported_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Import Batch"
+        verbose_name_plural = "Import Batches"
+        indexes = [
+            # Worker polling for queued and stalled jobs
+            models.Index(fields=["status", "created_at"], name="importbatch_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"Import #{self.pk} {self.file_name} ({self.status})"
+
+    @property
+    def upload_path(self):
+        return os.path.join(settings.IMPORT_ROOT, self.upload_name)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_IMPORTED, self.STATUS_FAILED)
+
+    @classmethod
+    def claimable(cls):
+        """
+        Background jobs a worker may take: queued ones, and running ones
+        whose worker stopped committing chunks IMPORT_STALL_SECONDS ago
+        """
+        stalled_before = timezone.now() - timedelta(
+            seconds=getattr(settings, "IMPORT_STALL_SECONDS", 300)
+        )
+        return cls.objects.filter(
+            Q(status=cls.STATUS_QUEUED)
+            | Q(status=cls.STATUS_RUNNING, heartbeat_at__lt=stalled_before)
+        )
+
+    def as_dict(self, error_limit=20):
+        return {
+            "id": self.pk,
+            "file_name": self.file_name,
+            "status": self.status,
+            "rows_processed": self.rows_processed,
+            "imported_rows": self.imported_rows,
+            "updated_rows": self.updated_rows,
+            "error_rows": self.error_rows,
+            "error": self.error,
+            "errors": [
+                {"row_number": number, "errors": errors}
+                for number, errors in self.rows.filter(is_valid=False)
+                .order_by("row_number")
+                .values_list("row_number", "errors")[:error_limit]
+            ],
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    @classmethod
+    def purge_stale(cls, hours=24):
+        """
+        Drop staged batches nobody confirmed (their rows cascade)
+        """
+        return cls.objects.filter(
+            status=cls.STATUS_STAGED,
+            created_at__lt=timezone.now() - timedelta(hours=hours),
+        ).delete()[0]
+
+
+class ImportRow(models.Model):
+    """
+    A staged CSV row: the values as uploaded, the reference ids they
+    resolved to, and any validation errors
+    """
+    batch = models.ForeignKey(ImportBatch, on_delete=models.CASCADE, related_name="rows")
+    row_number = models.PositiveIntegerField()
+
+    device_name = models.CharField(max_length=100, blank=True)
+    device_model = models.CharField(max_length=100, blank=True)
+    serial_number = models.CharField(max_length=100, blank=True)
+    staff_name = models.CharField(max_length=255, blank=True)
+
+    # Reference names as shown in the preview
+    device_type_name = models.CharField(max_length=100, blank=True)
+    status_name = models.CharField(max_length=100, blank=True)
+    location_name = models.CharField(max_length=100, blank=True)
+    department_name = models.CharField(max_length=100, blank=True)
+
+    # Upsert batches: the registered asset this row updates
+    asset = models.ForeignKey(
+        "Asset", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+
+    # Resolved references (set on valid rows)
+    device_type = models.ForeignKey(
+        "DeviceType", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    status = models.ForeignKey(
+        "DeviceStatus", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    location = models.ForeignKey(
+        "Location", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    department = models.ForeignKey(
+        "Department", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+
+    is_valid = models.BooleanField(default=True)
+    errors = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ["row_number"]
+        indexes = [
+            # Paginated preview of valid / error rows and promotion
+            models.Index(fields=["batch", "is_valid", "row_number"], name="importrow_batch_idx"),
+            models.Index(fields=["serial_number"], name="importrow_serial_idx"),
+        ]
+
+    def __str__(self):
+        return f"Row {self.row_number} of import #{self.batch_id}"
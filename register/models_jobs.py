@@ -0,0 +1,35 @@
+from django.utils import timezone
+
+
+class BackgroundJob:
+    """
+    Claiming for the job models run by utils_jobs (ExportJob,
+    ImportBatch). The model has status, started_at and heartbeat_at
+    fields, a STATUS_RUNNING status and a claimable() classmethod
+    returning the jobs a worker may take.
+    """
+
+    @classmethod
+    def claimable(cls):
+        raise NotImplementedError
+
+    def claim(self):
+        """
+        Move a claimable job to running. Guarded on the heartbeat this
+        instance last saw, so of two workers claiming the same queued or
+        stalled job only one succeeds; returns False for the other.
+        """
+        now = timezone.now()
+        claimed = type(self).claimable().filter(
+            pk=self.pk, heartbeat_at=self.heartbeat_at
+        ).update(
+            status=self.STATUS_RUNNING,
+            started_at=self.started_at or now,
+            heartbeat_at=now,
+        )
+
+        if claimed:
+            self.status = self.STATUS_RUNNING
+            self.started_at = self.started_at or now
+            self.heartbeat_at = now
+        return bool(claimed)
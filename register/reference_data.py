@@ -0,0 +1,156 @@
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+VERSION_KEY = "reference"
+
+REFERENCE_MODELS = {
+    "statuses": "register.DeviceStatus",
+    "device_types": "register.DeviceType",
+    "locations": "register.Location",
+    "departments": "register.Department",
+}
+
+
+class ReferenceTable:
+    def __init__(self, registry, model_label):
+        self.registry = registry
+        self.model_label = model_label
+        # (rows, {pk: row}, {lowercased name: row}), replaced as a whole so
+        # a reader never sees a half-loaded or cleared table
+        self._snapshot = None
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def _load(self):
+        rows = list(self.model.objects.order_by("pk"))
+        return (
+            rows,
+            {row.pk: row for row in rows},
+            {row.name.lower(): row for row in rows},
+        )
+
+    def _loaded(self):
+        """
+        The current snapshot, loading it if needed. Callers use the
+        returned tuple, never self._snapshot, which another thread may
+        clear at any time.
+        """
+        self.registry.check_version()
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self.registry.lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = self._load()
+        return snapshot
+
+    def clear(self):
+        with self.registry.lock:
+            self._snapshot = None
+
+    def all(self):
+        rows, _, _ = self._loaded()
+        return list(rows)
+
+    def get(self, pk):
+        """
+        Row by primary key (int or numeric string), or None
+        """
+        _, by_id, _ = self._loaded()
+        try:
+            return by_id.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def by_name(self, name):
+        """
+        Row by case-insensitive name (like name__iexact), or None
+        """
+        if name is None:
+            return None
+        _, _, by_name = self._loaded()
+        return by_name.get(name.strip().lower())
+
+    def name_map(self):
+        """
+        {lowercased name: row} for bulk lookups
+        """
+        _, _, by_name = self._loaded()
+        return dict(by_name)
+
+
+class ReferenceRegistry:
+    """
+    Process-local cache of the small reference tables
+    (DeviceStatus, DeviceType, Location, Department).
+
+    Each table is loaded once per process and served from memory. Writes
+    invalidate the local copy through post_save/post_delete and bump the
+    shared "reference" DataVersion; other worker processes compare that
+    counter at most every REFERENCE_DATA_CHECK_INTERVAL seconds and reload
+    when it moved.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.tables = {}
+        self._version = None
+        self._checked_at = 0.0
+
+        # Exposed as reference.statuses, reference.device_types, ...
+        for attr, label in REFERENCE_MODELS.items():
+            self.tables[label] = ReferenceTable(self, label)
+            setattr(self, attr, self.tables[label])
+
+    def table_for(self, model):
+        return self.tables[model._meta.label]
+
+    def invalidate(self):
+        with self.lock:
+            for table in self.tables.values():
+                table.clear()
+
+    def check_version(self):
+        """
+        Drop the local copies if another process bumped the shared version.
+        Hits the database at most once per REFERENCE_DATA_CHECK_INTERVAL.
+        """
+        interval = getattr(settings, "REFERENCE_DATA_CHECK_INTERVAL", 5)
+        now = time.monotonic()
+
+        if self._version is not None and now - self._checked_at < interval:
+            return
+
+        from .models_cache import DataVersion
+
+        version = DataVersion.get_version(VERSION_KEY)
+        self._checked_at = now
+
+        if version != self._version:
+            self.invalidate()
+            self._version = version
+
+    def decommissioned_status(self):
+        return self.statuses.by_name("decommissioned")
+
+
+reference = ReferenceRegistry()
+
+
+def reference_data_changed(sender, **kwargs):
+    from .models_cache import DataVersion
+
+    DataVersion.bump(VERSION_KEY)
+    transaction.on_commit(reference.invalidate)
+
+
+for _label in REFERENCE_MODELS.values():
+    post_save.connect(reference_data_changed, sender=_label)
+    post_delete.connect(reference_data_changed, sender=_label)
@@ -0,0 +1,39 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models_cache import DataVersion
+
+
+# DataVersion keys bumped whenever rows of these models are written
+ASSET_DATA_VERSION = "assets"
+AUDIT_DATA_VERSION = "audit"
+
+VERSION_KEYS = {
+    "register.Asset": ASSET_DATA_VERSION,
+    "register.AuditLog": AUDIT_DATA_VERSION,
+}
+
+
+def version_key_for(model):
+    return VERSION_KEYS.get(model._meta.label)
+
+
+@receiver([post_save, post_delete], sender="register.Asset")
+def asset_written(sender, **kwargs):
+    DataVersion.bump_on_commit(ASSET_DATA_VERSION)
+
+
+@receiver([post_save, post_delete], sender="register.AuditLog")
+def audit_log_written(sender, **kwargs):
+    DataVersion.bump_on_commit(AUDIT_DATA_VERSION)
+
+
+@receiver(post_save, sender="register.DeviceStatus")
+def device_status_saved(sender, instance, **kwargs):
+    # A status renamed to/from "decommissioned" flips is_active on its assets
+    from .models import Asset
+
+    is_active = instance.name.lower() != instance.STATUS_DECOMMISSIONED
+    Asset.objects.filter(status_id=instance.pk).exclude(is_active=is_active).update(
+        is_active=is_active
+    )
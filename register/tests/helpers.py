@@ -0,0 +1,64 @@
+from itertools import count
+
+from django.contrib.auth.models import User
+
+from register.models import Asset, DeviceStatus, DeviceType, Location, UserProfile
+from register.reference_data import reference
+
+_serials = count(1)
+
+
+def reference_rows():
+    """
+    A device type, the in-use status and a location, with the
+    process-wide reference cache dropped so it sees this test's rows
+    """
+    reference.invalidate()
+    return {
+        "device_type": DeviceType.objects.get_or_create(name="laptop")[0],
+        "status": DeviceStatus.objects.get_or_create(name=DeviceStatus.STATUS_IN_USE)[0],
+        "location": Location.objects.get(code="HQ"),
+    }
+
+
+def decommissioned_status():
+    status = DeviceStatus.objects.get_or_create(name=DeviceStatus.STATUS_DECOMMISSIONED)[0]
+    reference.invalidate()
+    return status
+
+
+def make_asset(refs, **fields):
+    serial = f"TEST-{next(_serials)}"
+    values = {
+        "device_name": f"Device {serial}",
+        "device_model": "Model",
+        "serial_number": serial,
+        **refs,
+        **fields,
+    }
+    return Asset.objects.create(**values)
+
+
+def make_user(role=UserProfile.ROLE_ADMIN):
+    user = User.objects.create_user(f"user-{next(_serials)}", password="pass")
+    user.profile.role = role
+    user.profile.save()
+    return user
+
+
+def csv_row(serial_number, **columns):
+    """
+    An uploaded CSV row (DictReader dict) for a valid in-use laptop at
+    Headquarters, with columns overridden by header
+    """
+    return {
+        "Device Name": "Laptop",
+        "Device Model": "Model",
+        "Serial Number": serial_number,
+        "Device Type": "laptop",
+        "Status": DeviceStatus.STATUS_IN_USE,
+        "Location": "Headquarters",
+        "Department": "",
+        "Staff Name": "",
+        **columns,
+    }
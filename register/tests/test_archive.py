@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from register.models import AuditLog, AuditLogArchive
+from register.utils_audit import AUDIT_LIST_ORDERING, archive_audit_log, audit_rows
+from register.utils_pagination import MergedCursorPaginator
+
+from .helpers import make_asset, reference_rows
+
+
+class ArchiveAuditLogTests(TestCase):
+    def setUp(self):
+        self.asset = make_asset(reference_rows())
+        AuditLog.objects.all().delete()
+        self.now = timezone.now()
+        self.cutoff = self.now - timedelta(days=30)
+
+    def entries(self, count, timestamp):
+        """
+        count entries, all stamped timestamp, ids ascending
+        """
+        ids = []
+        for index in range(count):
+            entry = AuditLog.objects.create(asset=self.asset, action="updated", new_value=str(index))
+            ids.append(entry.pk)
+        AuditLog.objects.filter(pk__in=ids).update(timestamp=timestamp)
+        return ids
+
+    def archive(self, batch_size):
+        table = AuditLogArchive._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            moved = archive_audit_log(self.cutoff, batch_size)
+        batches = sum(q["sql"].startswith(f'INSERT INTO "{table}"') for q in queries.captured_queries)
+        return moved, batches
+
+    def test_moves_every_old_row_once_in_bounded_batches(self):
+        old = self.entries(7, self.cutoff - timedelta(days=1))
+        recent = self.entries(2, self.now)
+
+        moved, batches = self.archive(batch_size=3)
+
+        self.assertEqual(moved, 7)
+        self.assertEqual(batches, 3)  # 3 + 3 + 1
+        self.assertEqual(sorted(AuditLogArchive.objects.values_list("pk", flat=True)), old)
+        self.assertEqual(sorted(AuditLog.objects.values_list("pk", flat=True)), recent)
+
+    def test_exact_multiple_of_the_batch_size(self):
+        old = self.entries(6, self.cutoff - timedelta(days=1))
+
+        moved, _ = self.archive(batch_size=3)
+
+        self.assertEqual(moved, 6)
+        self.assertEqual(sorted(AuditLogArchive.objects.values_list("pk", flat=True)), old)
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_rows_sharing_a_timestamp_across_a_batch_boundary(self):
+        old = self.entries(5, self.cutoff - timedelta(hours=1))
+
+        moved, batches = self.archive(batch_size=2)
+
+        self.assertEqual(moved, 5)
+        self.assertEqual(batches, 3)
+        self.assertEqual(sorted(AuditLogArchive.objects.values_list("pk", flat=True)), old)
+
+    def test_rows_at_the_cutoff_stay(self):
+        kept = self.entries(2, self.cutoff)
+
+        moved, _ = self.archive(batch_size=3)
+
+        self.assertEqual(moved, 0)
+        self.assertEqual(sorted(AuditLog.objects.values_list("pk", flat=True)), kept)
+
+
+class ArchivedAuditReadTests(TestCase):
+    """
+    Listings and exports read the archive and the hot table as one log
+    """
+
+    def setUp(self):
+        asset = make_asset(reference_rows())
+        AuditLog.objects.all().delete()
+        now = timezone.now()
+
+        for days in (40, 35, 31, 2, 1):
+            entry = AuditLog.objects.create(asset=asset, action="updated", new_value=str(days))
+            AuditLog.objects.filter(pk=entry.pk).update(timestamp=now - timedelta(days=days))
+
+        archive_audit_log(now - timedelta(days=30))
+        self.querysets = [AuditLogArchive.objects.all(), AuditLog.objects.all()]
+
+    def test_export_rows_merge_both_tables_oldest_first(self):
+        values = [row[-1] for row in audit_rows(self.querysets)]
+        self.assertEqual(values, ["40", "35", "31", "2", "1"])
+
+    def test_merged_pages_cross_from_hot_to_archived(self):
+        paginator = MergedCursorPaginator(self.querysets, 2, AUDIT_LIST_ORDERING)
+
+        pages = []
+        page = paginator.get_page()
+        while True:
+            pages.append([entry.new_value for entry in page])
+            if not page.has_next():
+                break
+            page = paginator.get_page(page.next_cursor)
+
+        self.assertEqual(pages, [["1", "2"], ["31", "35"], ["40"]])
+
+        previous = paginator.get_page(page.previous_cursor)
+        self.assertEqual([entry.new_value for entry in previous], ["31", "35"])
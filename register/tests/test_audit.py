@@ -0,0 +1,67 @@
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from register.models import AuditLog
+from register.utils import log_asset_action
+from register.utils_audit import buffered_audit
+
+from .helpers import make_asset, reference_rows
+
+
+class BufferedAuditTests(TestCase):
+    def setUp(self):
+        self.asset = make_asset(reference_rows())
+        AuditLog.objects.all().delete()
+
+    def log(self, value):
+        log_asset_action(None, self.asset, "updated", "staff_name", "", value)
+
+    def logged(self):
+        return sorted(AuditLog.objects.values_list("new_value", flat=True))
+
+    def test_block_writes_its_entries_with_one_insert_before_exiting(self):
+        table = AuditLog._meta.db_table
+
+        with CaptureQueriesContext(connection) as queries:
+            with buffered_audit():
+                for value in ("a", "b", "c"):
+                    self.log(value)
+                self.assertEqual(self.logged(), [])
+
+        inserts = [q for q in queries.captured_queries if q["sql"].startswith(f'INSERT INTO "{table}"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(self.logged(), ["a", "b", "c"])
+
+    def test_block_that_raises_writes_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with buffered_audit():
+                self.log("a")
+                raise RuntimeError
+
+        self.assertEqual(self.logged(), [])
+
+    def test_rolled_back_inner_savepoint_drops_only_its_entries(self):
+        with buffered_audit():
+            self.log("outer")
+            try:
+                with transaction.atomic():
+                    self.log("inner")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(self.logged(), ["outer"])
+
+    def test_nested_blocks_flush_separately(self):
+        with buffered_audit():
+            self.log("outer")
+            with buffered_audit():
+                self.log("inner")
+            self.assertEqual(self.logged(), ["inner"])
+
+        self.assertEqual(self.logged(), ["inner", "outer"])
+
+    def test_entries_outside_a_block_are_written_at_once(self):
+        self.log("a")
+        self.assertEqual(self.logged(), ["a"])
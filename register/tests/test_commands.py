@@ -0,0 +1,69 @@
+import csv
+import io
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from register.models import Asset, AuditLog
+
+from .helpers import csv_row, make_asset, reference_rows
+
+
+class ImportAssetsCommandTests(TestCase):
+    def setUp(self):
+        self.existing = make_asset(reference_rows())
+        AuditLog.objects.all().delete()
+
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+
+    def write_csv(self, rows):
+        path = os.path.join(self.root.name, "assets.csv")
+        with open(path, "w", newline="") as upload:
+            writer = csv.DictWriter(upload, fieldnames=list(csv_row("")))
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def test_imports_valid_rows_and_reports_each_rejected_row_once(self):
+        path = self.write_csv([
+            csv_row("A"),
+            csv_row("B"),
+            csv_row("C", **{"Device Type": "toaster"}),
+            # Repeats row 3 in a later chunk, after B has been written
+            csv_row("B"),
+            csv_row(self.existing.serial_number),
+        ])
+        errors_path = os.path.join(self.root.name, "errors.csv")
+
+        call_command(
+            "import_assets", path, "--workers", "1", "--chunk-size", "2", "--errors", errors_path,
+            stdout=io.StringIO(),
+        )
+
+        self.assertEqual(
+            sorted(Asset.objects.exclude(pk=self.existing.pk).values_list("serial_number", flat=True)),
+            ["A", "B"],
+        )
+        self.assertEqual(AuditLog.objects.filter(action="import").count(), 2)
+
+        with open(errors_path, newline="") as error_file:
+            rejected = [(row["Row"], row["Errors"]) for row in csv.DictReader(error_file)]
+        self.assertEqual(rejected, [
+            ("4", "Invalid device type 'toaster'"),
+            ("5", "Serial number 'B' is repeated in this file (first on row 3)"),
+            ("6", f"Serial number '{self.existing.serial_number}' already exists in the system"),
+        ])
+
+    def test_dry_run_writes_nothing(self):
+        path = self.write_csv([csv_row("A")])
+
+        call_command(
+            "import_assets", path, "--workers", "1", "--dry-run",
+            "--errors", os.path.join(self.root.name, "errors.csv"),
+            stdout=io.StringIO(),
+        )
+
+        self.assertFalse(Asset.objects.filter(serial_number="A").exists())
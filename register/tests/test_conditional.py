@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from register.models import Asset, AuditLog
+
+from .helpers import make_asset, make_user, reference_rows
+
+
+class ConditionalGetTests(TransactionTestCase):
+    """
+    Data versions are bumped by on_commit callbacks, which only run when
+    writes really commit; the seeded reference rows are restored for each
+    test
+    """
+    serialized_rollback = True
+
+    def setUp(self):
+        self.refs = reference_rows()
+        make_asset(self.refs)
+        self.client.force_login(make_user())
+
+    def write_asset(self):
+        make_asset(self.refs)
+
+    def test_matching_etag_gets_304_without_running_the_view(self):
+        url = reverse("export_assets_csv")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with mock.patch("register.views.export_assets_as") as export:
+            response = self.client.get(url, headers={"if-none-match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        export.assert_not_called()
+
+    def test_etag_changes_after_a_write(self):
+        url = reverse("export_assets_csv")
+        self.write_asset()
+        first = self.client.get(url)
+
+        self.write_asset()
+        second = self.client.get(url)
+
+        self.assertNotEqual(first["ETag"], second["ETag"])
+        self.assertEqual(self.client.get(url, headers={"if-none-match": first["ETag"]}).status_code, 200)
+        self.assertEqual(self.client.get(url, headers={"if-none-match": second["ETag"]}).status_code, 304)
+
+    def test_endpoints_only_track_their_own_data(self):
+        assets_etag = self.client.get(reverse("export_assets_csv"))["ETag"]
+        audit_etag = self.client.get(reverse("export_audit_log"))["ETag"]
+
+        # An audit entry changes the audit export only
+        AuditLog.objects.create(asset=Asset.objects.first(), action="updated")
+
+        self.assertNotEqual(self.client.get(reverse("export_audit_log"))["ETag"], audit_etag)
+        self.assertEqual(self.client.get(reverse("export_assets_csv"))["ETag"], assets_etag)
@@ -0,0 +1,135 @@
+import csv
+import io
+import unittest
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from register.models import Asset, ExportJob, Location
+from register.utils import csv_lines
+from register.utils_exports import columnar_export_available, export_file_response, export_queryset
+
+from .helpers import decommissioned_status, make_asset, make_user, reference_rows
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+def csv_serials(response):
+    content = b"".join(response.streaming_content).decode("utf-8-sig")
+    return sorted(row["Serial Number"] for row in csv.DictReader(io.StringIO(content)))
+
+
+class DecommissionedExportTests(TestCase):
+    def setUp(self):
+        refs = {**reference_rows(), "status": decommissioned_status()}
+        self.yola = make_asset({**refs, "location": Location.objects.get(code="YOL")})
+        self.hq = make_asset(refs)
+        self.client.force_login(make_user())
+
+    def test_synchronous_export_applies_the_list_filters_like_the_job(self):
+        params = {"location": [str(self.yola.location_id)]}
+
+        response = self.client.get(reverse("export_decommissioned_assets_csv"), {"location": params["location"]})
+
+        self.assertEqual(csv_serials(response), [self.yola.serial_number])
+        self.assertEqual(
+            list(export_queryset(ExportJob.KIND_DECOMMISSIONED, params).values_list("serial_number", flat=True)),
+            [self.yola.serial_number],
+        )
+
+    def test_unfiltered_export_lists_every_decommissioned_asset(self):
+        response = self.client.get(reverse("export_decommissioned_assets_csv"))
+
+        self.assertEqual(csv_serials(response), sorted([self.yola.serial_number, self.hq.serial_number]))
+
+
+class StreamingCsvTests(TestCase):
+    def setUp(self):
+        self.refs = reference_rows()
+
+    def export_queries(self, asset_count, **kwargs):
+        for _ in range(asset_count):
+            make_asset(self.refs)
+
+        with CaptureQueriesContext(connection) as queries:
+            lines = list(csv_lines(Asset.objects.order_by("-id"), **kwargs))
+
+        self.assertEqual(len(lines), Asset.objects.count() + 1)
+        return len(queries.captured_queries)
+
+    def test_query_count_does_not_grow_with_the_rows(self):
+        self.assertEqual(self.export_queries(3), self.export_queries(40))
+
+    def test_keyset_mode_costs_one_query_per_chunk(self):
+        with self.settings(EXPORT_CHUNK_SIZE=10):
+            self.assertEqual(self.export_queries(25, keyset=True), 3)
+
+    def test_rows_carry_reference_names_and_blank_optionals(self):
+        asset = make_asset(self.refs, staff_name="Carol")
+
+        [header, line] = list(csv.reader(csv_lines(Asset.objects.filter(pk=asset.pk))))
+
+        row = dict(zip(header, line))
+        self.assertEqual(
+            (row["Serial Number"], row["Device Type"], row["Location"], row["Department"], row["Staff Name"]),
+            (asset.serial_number, "laptop", "Headquarters", "", "Carol"),
+        )
+
+
+class FileFormatTests(TestCase):
+    def setUp(self):
+        refs = reference_rows()
+        self.assets = [
+            make_asset(refs, staff_name="Carol"),
+            make_asset(refs, device_name="Tab <&> \"quoted\"\x01"),
+        ]
+        self.stamp = datetime(2026, 3, 1, 9, 30, tzinfo=dt_timezone.utc)
+        Asset.objects.update(updated_at=self.stamp, created_at=self.stamp)
+
+    def export(self, export_format):
+        response = export_file_response(Asset.objects.order_by("id"), export_format)
+        return b"".join(response.streaming_content)
+
+    @unittest.skipUnless(columnar_export_available(), "pyarrow is not installed")
+    def test_parquet_round_trip(self):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(io.BytesIO(self.export("parquet")))
+        self.assert_columnar_rows(table)
+
+    @unittest.skipUnless(columnar_export_available(), "pyarrow is not installed")
+    def test_arrow_round_trip(self):
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(self.export("arrow")).read_all()
+        self.assert_columnar_rows(table)
+
+    def assert_columnar_rows(self, table):
+        rows = table.to_pylist()
+
+        self.assertEqual([row["id"] for row in rows], [asset.pk for asset in self.assets])
+        self.assertEqual(rows[0]["device_type"], "laptop")
+        self.assertEqual(rows[0]["location"], "Headquarters")
+        self.assertIsNone(rows[0]["department"])
+        self.assertEqual(rows[0]["staff_name"], "Carol")
+        self.assertEqual(rows[1]["device_name"], self.assets[1].device_name)
+        self.assertEqual(rows[0]["updated_at"], self.stamp)
+
+    @unittest.skipIf(openpyxl is None, "openpyxl is not installed")
+    def test_xlsx_round_trip(self):
+        sheet = openpyxl.load_workbook(io.BytesIO(self.export("xlsx"))).active
+        header, *rows = sheet.iter_rows(values_only=True)
+
+        self.assertEqual(header[2], "Serial Number")
+        self.assertEqual([row[2] for row in rows], [asset.serial_number for asset in self.assets])
+        self.assertEqual(rows[0][3], "laptop")
+        self.assertIsNone(rows[0][6])
+        # Characters XML cannot hold are dropped, the rest escaped
+        self.assertEqual(rows[1][0], 'Tab <&> "quoted"')
+        self.assertEqual(rows[0][8], datetime(2026, 3, 1, 9, 30))
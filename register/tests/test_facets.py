@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from register.models import Asset, DeviceType, Location
+from register.utils import asset_facets
+
+from .helpers import make_asset, reference_rows
+
+
+class AssetFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        refs = reference_rows()
+        self.laptop = refs["device_type"]
+        self.desktop = DeviceType.objects.create(name="desktop")
+        self.hq = refs["location"]
+        self.yola = Location.objects.get(code="YOL")
+
+        for location, device_type, count in [
+            (self.hq, self.laptop, 3),
+            (self.hq, self.desktop, 1),
+            (self.yola, self.laptop, 2),
+        ]:
+            for _ in range(count):
+                make_asset({**refs, "location": location, "device_type": device_type})
+
+    def facets(self, **params):
+        request = RequestFactory().get("/", params)
+        return asset_facets(request, Asset.objects.all())
+
+    def test_unfiltered_counts(self):
+        facets = self.facets()
+
+        self.assertEqual(facets["location"], {self.hq.pk: 4, self.yola.pk: 2})
+        self.assertEqual(facets["device_type"], {self.laptop.pk: 5, self.desktop.pk: 1})
+
+    def test_each_facet_ignores_its_own_selection(self):
+        facets = self.facets(location=self.yola.pk)
+
+        # Every location still counted, so the dropdown shows alternatives
+        self.assertEqual(facets["location"], {self.hq.pk: 4, self.yola.pk: 2})
+        # The other facets only count the selected location
+        self.assertEqual(facets["device_type"], {self.laptop.pk: 2})
+
+    def test_each_facet_honours_the_other_selections(self):
+        facets = self.facets(location=self.hq.pk, device_type=self.desktop.pk)
+
+        self.assertEqual(facets["location"], {self.hq.pk: 1})
+        self.assertEqual(facets["device_type"], {self.laptop.pk: 3, self.desktop.pk: 1})
+        self.assertEqual(sum(facets["device_status"].values()), 1)
+
+    def test_search_terms_narrow_every_facet(self):
+        serial = Asset.objects.filter(location=self.yola).values_list("serial_number", flat=True).first()
+        facets = self.facets(serial_number=serial)
+
+        self.assertEqual(facets["location"], {self.yola.pk: 1})
+        self.assertEqual(facets["device_type"], {self.laptop.pk: 1})
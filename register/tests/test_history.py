@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from register.models import Asset, AuditLog, AuditLogArchive, DeviceType, Location
+from register.utils_audit import archive_audit_log
+from register.utils_history import nearest_checkpoint, register_as_of, take_checkpoint
+
+from .helpers import make_asset, make_user, reference_rows
+
+
+class RegisterAsOfTests(TestCase):
+    """
+    One asset created at base, moved Headquarters -> Abuja (and assigned
+    to Carol) a day later and Abuja -> Yola a day after that; a second
+    asset registered on day 3
+    """
+
+    def setUp(self):
+        refs = reference_rows()
+        self.base = timezone.now() - timedelta(days=10)
+
+        self.asset = make_asset(refs, location=Location.objects.get(code="YOL"), staff_name="Carol")
+        self.later = make_asset(refs)
+        Asset.objects.filter(pk=self.asset.pk).update(created_at=self.base)
+        Asset.objects.filter(pk=self.later.pk).update(created_at=self.base + timedelta(days=3))
+        AuditLog.objects.all().delete()
+
+        self.change("location", "Headquarters", "Abuja", days=1)
+        self.change("staff_name", "None", "Carol", days=1)
+        self.change("location", "Abuja", "Yola", days=2)
+
+    def change(self, field, old, new, days=None):
+        entry = AuditLog.objects.create(
+            asset=self.asset, action="updated", field_name=field, old_value=old, new_value=new
+        )
+        if days is not None:
+            AuditLog.objects.filter(pk=entry.pk).update(timestamp=self.base + timedelta(days=days))
+
+    def states(self, when):
+        return {state["asset_id"]: state for state in register_as_of(when)}
+
+    def state(self, when):
+        return self.states(when)[self.asset.pk]
+
+    def test_replays_from_the_live_table_without_a_checkpoint(self):
+        self.assertIsNone(nearest_checkpoint(self.base))
+
+        first = self.state(self.base + timedelta(hours=12))
+        self.assertEqual((first["location"], first["staff_name"]), ("Headquarters", ""))
+
+        middle = self.state(self.base + timedelta(days=1, hours=12))
+        self.assertEqual((middle["location"], middle["staff_name"]), ("Abuja", "Carol"))
+
+        self.assertEqual(self.state(timezone.now())["location"], "Yola")
+
+    def test_only_assets_registered_by_then_are_listed(self):
+        self.assertEqual(list(self.states(self.base + timedelta(days=2))), [self.asset.pk])
+        self.assertEqual(set(self.states(timezone.now())), {self.asset.pk, self.later.pk})
+
+    def test_replays_from_the_nearest_later_checkpoint(self):
+        checkpoint = take_checkpoint()
+        self.assertEqual(checkpoint.asset_count, 2)
+
+        # After the checkpoint: an audited move, and a silent edit only the
+        # live table has
+        Asset.objects.filter(pk=self.asset.pk).update(
+            location=Location.objects.get(code="YAB"), staff_name="Zed"
+        )
+        self.change("location", "Yola", "Yaba")
+
+        when = self.base + timedelta(days=1, hours=12)
+        self.assertEqual(nearest_checkpoint(when), checkpoint)
+
+        middle = self.state(when)
+        self.assertEqual((middle["location"], middle["staff_name"]), ("Abuja", "Carol"))
+
+        # Later than every checkpoint: the live table
+        self.assertIsNone(nearest_checkpoint(timezone.now()))
+        self.assertEqual(self.state(timezone.now())["staff_name"], "Zed")
+
+    def test_archived_entries_are_undone_too(self):
+        archive_audit_log(self.base + timedelta(days=1, hours=12))
+        self.assertEqual(AuditLogArchive.objects.count(), 2)
+
+        for use_checkpoint in (False, True):
+            if use_checkpoint:
+                take_checkpoint()
+
+            first = self.state(self.base + timedelta(hours=12))
+            self.assertEqual((first["location"], first["staff_name"]), ("Headquarters", ""))
+
+    def test_device_type_edited_in_the_form_is_undone(self):
+        self.client.force_login(make_user())
+        before = timezone.now()
+
+        response = self.client.post(reverse("asset_update", args=[self.asset.pk]), {
+            "device_name": self.asset.device_name,
+            "device_model": self.asset.device_model,
+            "serial_number": self.asset.serial_number,
+            "device_type": DeviceType.objects.create(name="desktop").pk,
+            "status": self.asset.status_id,
+            "location": self.asset.location_id,
+            "staff_name": "Carol",
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(
+            AuditLog.objects.filter(asset=self.asset, field_name="device_type", new_value="desktop").exists()
+        )
+
+        self.assertEqual(self.state(timezone.now())["device_type"], "desktop")
+        self.assertEqual(self.state(before)["device_type"], "laptop")
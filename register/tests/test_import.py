@@ -0,0 +1,169 @@
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from register.models import Asset, AuditLog, ImportBatch
+from register.utils_audit import buffered_audit
+from register.utils_import import clean_row, create_assets, promote_batch, reject_changed_rows, stage_import
+
+from .helpers import csv_row, decommissioned_status, make_asset, make_user, reference_rows
+
+
+class PromoteBatchTests(TestCase):
+    def setUp(self):
+        self.refs = reference_rows()
+        self.user = make_user()
+
+    def stage(self, rows, upsert=False):
+        batch = ImportBatch.objects.create(upsert=upsert, created_by=self.user)
+        return stage_import(rows, batch)
+
+    def promote(self, batch):
+        with transaction.atomic():
+            return promote_batch(ImportBatch.objects.select_for_update().get(pk=batch.pk), self.user)
+
+    def row_errors(self, batch):
+        return list(batch.rows.filter(is_valid=False).values_list("serial_number", "errors"))
+
+    def test_valid_rows_become_assets_with_one_import_entry_each(self):
+        batch = self.stage([csv_row("NEW-1", **{"Staff Name": "Carol"}), csv_row("NEW-2"), csv_row("NEW-3", **{"Device Type": "toaster"})])
+        self.assertEqual((batch.valid_rows, batch.error_rows), (2, 1))
+
+        self.assertEqual(self.promote(batch), (2, 0))
+
+        assets = Asset.objects.filter(serial_number__in=["NEW-1", "NEW-2"])
+        self.assertEqual(
+            sorted(assets.values_list("serial_number", "staff_name", "location__code", "is_active")),
+            [("NEW-1", "Carol", "HQ", True), ("NEW-2", "", "HQ", True)],
+        )
+        self.assertEqual(
+            sorted(AuditLog.objects.values_list("asset__serial_number", "action", "user")),
+            [("NEW-1", "import", self.user.pk), ("NEW-2", "import", self.user.pk)],
+        )
+
+        batch.refresh_from_db()
+        self.assertEqual((batch.status, batch.imported_rows), (ImportBatch.STATUS_IMPORTED, 2))
+
+    def test_serial_registered_after_the_preview_becomes_a_row_error(self):
+        batch = self.stage([csv_row("NEW-1"), csv_row("NEW-2")])
+        make_asset(self.refs, serial_number="NEW-2")
+
+        self.assertEqual(self.promote(batch), (1, 0))
+        self.assertEqual(
+            self.row_errors(batch), [("NEW-2", ["Serial number 'NEW-2' already exists in the system"])]
+        )
+
+        batch.refresh_from_db()
+        self.assertEqual((batch.valid_rows, batch.error_rows), (1, 1))
+
+    def test_serial_committed_after_the_recheck_is_caught_by_the_constraint(self):
+        batch = self.stage([csv_row("NEW-1"), csv_row("NEW-2")])
+        calls = []
+
+        def recheck(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                # As if another transaction committed NEW-2 just after the check
+                make_asset(self.refs, serial_number="NEW-2")
+                return 0
+            return reject_changed_rows(batch)
+
+        with mock.patch("register.utils_import.reject_changed_rows", side_effect=recheck):
+            self.assertEqual(self.promote(batch), (1, 0))
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(Asset.objects.filter(serial_number="NEW-2").count(), 1)
+        self.assertEqual(
+            self.row_errors(batch), [("NEW-2", ["Serial number 'NEW-2' already exists in the system"])]
+        )
+
+    def test_asset_decommissioned_after_the_preview_is_not_updated(self):
+        current = make_asset(self.refs)
+        retired = make_asset(self.refs)
+        batch = self.stage(
+            [
+                csv_row(current.serial_number, **{"Staff Name": "Dave"}),
+                csv_row(retired.serial_number, **{"Staff Name": "Dave"}),
+            ],
+            upsert=True,
+        )
+        self.assertEqual(batch.valid_rows, 2)
+
+        Asset.objects.filter(pk=retired.pk).update(status=decommissioned_status(), is_active=False)
+
+        self.assertEqual(self.promote(batch), (0, 1))
+        self.assertEqual(
+            list(Asset.objects.filter(staff_name="Dave").values_list("pk", flat=True)), [current.pk]
+        )
+        self.assertEqual(
+            self.row_errors(batch),
+            [(retired.serial_number, [f"Asset '{retired.serial_number}' is decommissioned and cannot be updated by import"])],
+        )
+
+    def test_confirm_reports_rows_skipped_since_the_preview(self):
+        self.client.force_login(self.user)
+        batch = self.stage([csv_row("NEW-1"), csv_row("NEW-2")])
+        session = self.client.session
+        session["import_batch"] = batch.pk
+        session.save()
+        make_asset(self.refs, serial_number="NEW-2")
+
+        response = self.client.post(reverse("confirm_import"), follow=True)
+
+        self.assertRedirects(response, reverse("asset_list"))
+        self.assertEqual(
+            [str(message) for message in response.context["messages"]],
+            [
+                "1 rows were skipped because the register changed since the preview.",
+                "1 assets imported successfully.",
+            ],
+        )
+
+
+def inserts_into(queries, table):
+    return [query for query in queries if query["sql"].startswith(f'INSERT INTO "{table}"')]
+
+
+class BulkImportQueryTests(TestCase):
+    def setUp(self):
+        reference_rows()
+        self.user = make_user()
+
+    @override_settings(IMPORT_BATCH_SIZE=2)
+    def test_create_assets_inserts_one_batch_at_a_time(self):
+        rows = [clean_row(csv_row(f"NEW-{n}")) for n in range(5)]
+
+        with CaptureQueriesContext(connection) as queries, buffered_audit():
+            self.assertEqual(create_assets(rows, self.user), 5)
+
+        self.assertEqual(len(inserts_into(queries, "register_asset")), 3)
+        # The audit entries wait for the end of the buffered_audit() block
+        self.assertEqual(len(inserts_into(queries, "register_auditlog")), 1)
+        self.assertEqual(AuditLog.objects.filter(action="import").count(), 5)
+
+    def test_confirm_query_count_does_not_grow_with_the_rows(self):
+        self.client.force_login(self.user)
+
+        def confirm(rows):
+            batch = ImportBatch.objects.create(created_by=self.user)
+            stage_import(rows, batch)
+            session = self.client.session
+            session["import_batch"] = batch.pk
+            session.save()
+
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(reverse("confirm_import"))
+            return queries
+
+        # The first request also fills the process-wide caches
+        confirm([csv_row("WARM-1")])
+        small = confirm([csv_row(f"SMALL-{n}") for n in range(2)])
+        large = confirm([csv_row(f"LARGE-{n}") for n in range(40)])
+
+        self.assertEqual(Asset.objects.filter(serial_number__startswith="LARGE-").count(), 40)
+        self.assertEqual(len(inserts_into(large, "register_asset")), 1)
+        self.assertEqual(len(inserts_into(large, "register_auditlog")), 1)
+        self.assertEqual(len(large), len(small))
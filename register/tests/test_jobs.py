@@ -0,0 +1,111 @@
+import csv
+import os
+import tempfile
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from register.models import Asset, ExportJob, ImportBatch
+from register.utils_import import run_import_job, run_queued_import_jobs
+
+from .helpers import csv_row, make_user, reference_rows
+
+
+class ImportJobTests(TestCase):
+    def setUp(self):
+        reference_rows()
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        settings = override_settings(IMPORT_ROOT=self.root.name, IMPORT_CHUNK_SIZE=2)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def queue(self, serials, **fields):
+        """
+        A queued background import of one CSV row per serial
+        """
+        name = "upload.csv"
+        with open(os.path.join(self.root.name, name), "w", newline="") as upload:
+            writer = csv.DictWriter(upload, fieldnames=list(csv_row("")))
+            writer.writeheader()
+            writer.writerows(csv_row(serial) for serial in serials)
+
+        return ImportBatch.objects.create(
+            upload_name=name, status=ImportBatch.STATUS_QUEUED, created_by=make_user(), **fields
+        )
+
+    def errors(self, batch):
+        return list(batch.rows.values_list("row_number", "errors"))
+
+    def test_only_one_of_two_workers_claims_a_job(self):
+        batch = self.queue(["A"])
+        first, second = ImportBatch.objects.get(pk=batch.pk), ImportBatch.objects.get(pk=batch.pk)
+
+        self.assertTrue(first.claim())
+        self.assertFalse(second.claim())
+        self.assertFalse(ImportBatch.claimable().filter(pk=batch.pk).exists())
+
+    def test_stalled_job_is_claimed_again_keeping_its_start(self):
+        batch = self.queue(["A"])
+        self.assertTrue(batch.claim())
+        started_at = batch.started_at
+
+        stale = timezone.now() - timedelta(hours=1)
+        ImportBatch.objects.filter(pk=batch.pk).update(heartbeat_at=stale)
+
+        resumed = ImportBatch.objects.get(pk=batch.pk)
+        self.assertTrue(resumed.claim())
+        self.assertEqual(resumed.started_at, started_at)
+        self.assertGreater(resumed.heartbeat_at, stale)
+
+    def test_stalled_job_resumes_after_its_committed_rows(self):
+        # Rows 2-3 were committed before the worker stalled; row 5 repeats
+        # row 3's serial across the resume point
+        batch = self.queue(["A", "B", "C", "B", "D"])
+        reference = reference_rows()
+        for serial in ("A", "B"):
+            Asset.objects.create(device_name="Laptop", device_model="Model", serial_number=serial, **reference)
+        ImportBatch.objects.filter(pk=batch.pk).update(
+            status=ImportBatch.STATUS_RUNNING,
+            rows_processed=2,
+            valid_rows=2,
+            imported_rows=2,
+            started_at=timezone.now() - timedelta(hours=1),
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(run_queued_import_jobs(), 1)
+
+        batch.refresh_from_db()
+        self.assertEqual(batch.status, ImportBatch.STATUS_IMPORTED)
+        self.assertEqual((batch.rows_processed, batch.imported_rows, batch.error_rows), (5, 4, 1))
+        self.assertEqual(
+            sorted(Asset.objects.values_list("serial_number", flat=True)), ["A", "B", "C", "D"]
+        )
+        self.assertEqual(self.errors(batch), [(5, ["Serial number 'B' is repeated in this file (first on row 3)"])])
+        self.assertFalse(os.path.exists(batch.upload_path))
+
+    def test_worker_that_lost_its_claim_stops_without_writing(self):
+        batch = self.queue(["A", "B", "C"])
+        self.assertTrue(batch.claim())
+
+        # Another worker resumed the job and committed the first chunk
+        ImportBatch.objects.filter(pk=batch.pk).update(rows_processed=2)
+
+        run_import_job(batch)
+
+        self.assertFalse(Asset.objects.exists())
+        batch.refresh_from_db()
+        self.assertEqual((batch.status, batch.rows_processed), (ImportBatch.STATUS_RUNNING, 2))
+        self.assertTrue(os.path.exists(batch.upload_path))
+
+
+class ExportJobClaimTests(TestCase):
+    def test_only_queued_exports_are_claimed_once(self):
+        job = ExportJob.objects.create(kind=ExportJob.KIND_ASSETS)
+        other = ExportJob.objects.get(pk=job.pk)
+
+        self.assertTrue(job.claim())
+        self.assertFalse(other.claim())
+        self.assertEqual(ExportJob.objects.get(pk=job.pk).status, ExportJob.STATUS_RUNNING)
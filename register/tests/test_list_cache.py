@@ -0,0 +1,34 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .helpers import make_asset, make_user, reference_rows
+
+
+@override_settings(ASSET_LIST_PAGINATION="page")
+class ListCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.refs = reference_rows()
+        make_asset(self.refs)
+        self.client.force_login(make_user())
+
+    def pagination(self, query):
+        response = self.client.get(
+            reverse("asset_list") + query, headers={"x-requested-with": "XMLHttpRequest"}
+        )
+        return response.json()["pagination"]
+
+    def test_blank_cursor_and_no_cursor_are_cached_apart(self):
+        self.assertNotIn("Showing", self.pagination("?cursor="))
+        self.assertIn("Showing", self.pagination("?"))
+        self.assertNotIn("Showing", self.pagination("?cursor="))
+
+    def test_blank_filters_share_the_unfiltered_entry(self):
+        unfiltered = self.pagination("?")
+
+        # Served from the cache: the new asset is not counted yet only
+        # because nothing bumped the data version inside the test
+        # transaction
+        make_asset(self.refs)
+        self.assertEqual(self.pagination("?serial_number=&location="), unfiltered)
@@ -0,0 +1,130 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from register.models import Asset
+from register.utils_pagination import CursorPaginator, EstimatedCountPaginator
+
+from .helpers import make_asset, reference_rows
+
+
+class CursorPaginatorTests(TestCase):
+    def setUp(self):
+        refs = reference_rows()
+        assets = [make_asset(refs) for _ in range(8)]
+
+        # Three groups sharing an updated_at: only the id tiebreaker
+        # orders rows within a group
+        base = timezone.now() - timedelta(days=1)
+        for index, asset in enumerate(assets):
+            Asset.objects.filter(pk=asset.pk).update(updated_at=base + timedelta(hours=index // 3))
+
+        self.queryset = Asset.objects.all()
+        self.ordering = ("-updated_at", "-id")
+        self.expected = list(self.queryset.order_by(*self.ordering).values_list("pk", flat=True))
+
+    def walk_forward(self, paginator):
+        pages = []
+        page = paginator.get_page()
+        while True:
+            pages.append([asset.pk for asset in page])
+            if not page.has_next():
+                return pages, page
+            page = paginator.get_page(page.next_cursor)
+
+    def test_forward_pages_cover_every_row_once_in_order(self):
+        pages, _ = self.walk_forward(CursorPaginator(self.queryset, 3, self.ordering))
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 2])
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+
+    def test_previous_cursor_returns_the_same_pages(self):
+        paginator = CursorPaginator(self.queryset, 3, self.ordering)
+        pages, page = self.walk_forward(paginator)
+
+        backward = [[asset.pk for asset in page]]
+        while page.has_previous():
+            page = paginator.get_page(page.previous_cursor)
+            backward.append([asset.pk for asset in page])
+
+        self.assertEqual(backward[::-1], pages)
+        self.assertFalse(page.has_previous())
+
+    def test_cursor_round_trip_keeps_the_key(self):
+        paginator = CursorPaginator(self.queryset, 3, self.ordering)
+        asset = self.queryset.order_by(*self.ordering)[2]
+
+        values, direction = paginator.decode_cursor(paginator.encode_cursor(asset, "n"))
+
+        self.assertEqual(direction, "n")
+        self.assertEqual(values, [asset.updated_at.isoformat(), asset.pk])
+
+    def test_tampered_or_foreign_cursor_falls_back_to_the_first_page(self):
+        paginator = CursorPaginator(self.queryset, 3, self.ordering)
+        token = paginator.get_page().next_cursor
+        other = CursorPaginator(self.queryset, 3, ("device_name", "id"))
+
+        for bad in (token[:-2] + "xx", other.get_page().next_cursor):
+            page = paginator.get_page(bad)
+            self.assertEqual([asset.pk for asset in page], self.expected[:3])
+            self.assertFalse(page.has_previous())
+
+
+@override_settings(PAGINATOR_EXACT_COUNT_LIMIT=5)
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.refs = reference_rows()
+
+    def paginator(self, count):
+        for _ in range(count):
+            make_asset(self.refs)
+        return EstimatedCountPaginator(Asset.objects.order_by("-id"), 2)
+
+    def test_small_results_are_counted_exactly(self):
+        paginator = self.paginator(5)
+
+        self.assertEqual(paginator.count, 5)
+        self.assertFalse(paginator.is_estimate)
+        self.assertEqual(paginator.num_pages, 3)
+
+    def test_large_results_use_a_cached_exact_count_without_an_estimate(self):
+        paginator = self.paginator(7)
+
+        self.assertEqual(paginator.count, 7)
+        self.assertFalse(paginator.is_estimate)
+
+        # The bounded count runs again, the full COUNT(*) does not
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(EstimatedCountPaginator(Asset.objects.order_by("-id"), 2).count, 7)
+
+        counts = [q["sql"] for q in queries.captured_queries if "COUNT(" in q["sql"]]
+        self.assertEqual(len(counts), 1)
+        self.assertIn("LIMIT 6", counts[0])
+
+    @mock.patch("register.utils_pagination.planner_row_estimate", return_value=40)
+    @mock.patch("register.utils_pagination.connection", vendor="postgresql")
+    def test_large_results_switch_to_the_planner_estimate(self, vendor_connection, estimate):
+        paginator = self.paginator(7)
+
+        self.assertEqual(paginator.count, 40)
+        self.assertTrue(paginator.is_estimate)
+
+        # Next page comes from the rows fetched, not the estimate
+        self.assertTrue(paginator.get_page(3).has_next())
+        last = paginator.get_page(4)
+        self.assertEqual(len(last), 1)
+        self.assertFalse(last.has_next())
+
+        # Past the real end: back to the first page
+        self.assertEqual(paginator.get_page(10).number, 1)
+
+    @mock.patch("register.utils_pagination.planner_row_estimate", return_value=3)
+    @mock.patch("register.utils_pagination.connection", vendor="postgresql")
+    def test_estimate_never_undercounts_the_bounded_count(self, vendor_connection, estimate):
+        self.assertEqual(self.paginator(7).count, 6)
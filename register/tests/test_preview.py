@@ -0,0 +1,95 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from register.models import Department
+from register.reference_data import reference
+from register.utils_import import validate_import
+
+from .helpers import csv_row, decommissioned_status, make_asset, make_user, reference_rows
+
+
+class ValidateImportTests(TestCase):
+    def setUp(self):
+        self.refs = reference_rows()
+        Department.objects.create(name="Finance")
+        reference.invalidate()
+
+    def validate(self, rows, upsert=False):
+        return [(number, errors) for number, _, errors in validate_import(rows, chunk_size=2, upsert=upsert)]
+
+    def test_reference_messages_name_the_rejected_value(self):
+        decommissioned_status()
+        rows = [
+            csv_row("NEW-1", **{"Device Type": "toaster"}),
+            csv_row("NEW-2", Status="lost at sea"),
+            csv_row("NEW-3", Status="Decommissioned"),
+            csv_row("NEW-4", Location="Moon Base"),
+            csv_row("NEW-5", Department="Catering"),
+        ]
+
+        self.assertEqual(self.validate(rows), [
+            (2, ["Invalid device type 'toaster'"]),
+            (3, ["Invalid status 'lost at sea'"]),
+            (4, ["Cannot import assets with 'decommissioned' status"]),
+            (5, ["Invalid location 'Moon Base'"]),
+            (6, ["Invalid department 'Catering'"]),
+        ])
+
+    def test_every_error_on_a_row_is_reported(self):
+        row = csv_row("NEW-1", **{"Device Type": "toaster", "Location": "Moon Base"})
+
+        self.assertEqual(self.validate([row]), [
+            (2, ["Invalid device type 'toaster'", "Invalid location 'Moon Base'"]),
+        ])
+
+    def test_registered_and_repeated_serials(self):
+        make_asset(self.refs, serial_number="OLD-1")
+        # The repeat falls in the next chunk
+        rows = [csv_row("OLD-1"), csv_row("NEW-1"), csv_row("NEW-1")]
+
+        self.assertEqual(self.validate(rows), [
+            (2, ["Serial number 'OLD-1' already exists in the system"]),
+            (3, []),
+            (4, ["Serial number 'NEW-1' is repeated in this file (first on row 3)"]),
+        ])
+
+    def test_upsert_rejects_only_decommissioned_assets(self):
+        make_asset(self.refs, serial_number="OLD-1")
+        make_asset(self.refs, serial_number="OLD-2", status=decommissioned_status(), is_active=False)
+
+        self.assertEqual(self.validate([csv_row("OLD-1"), csv_row("OLD-2")], upsert=True), [
+            (2, []),
+            (3, ["Asset 'OLD-2' is decommissioned and cannot be updated by import"]),
+        ])
+
+    def test_valid_rows_take_the_canonical_spelling(self):
+        row = csv_row("NEW-1", **{"Device Type": "LAPTOP", "Location": "headquarters", "Department": "FINANCE"})
+
+        (_, values, errors), = validate_import([row])
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            (values["device_type"], values["location"], values["department"]),
+            ("laptop", "Headquarters", "Finance"),
+        )
+
+
+class ImportPreviewViewTests(TestCase):
+    def setUp(self):
+        reference_rows()
+        self.client.force_login(make_user())
+
+    def test_preview_lists_row_errors(self):
+        upload = SimpleUploadedFile("assets.csv", (
+            "Device Name,Device Model,Serial Number,Device Type,Status,Location,Department,Staff Name\n"
+            "Laptop,Model,NEW-1,laptop,in-use,Headquarters,,\n"
+            "Laptop,Model,NEW-2,toaster,in-use,Moon Base,,\n"
+        ).encode())
+
+        response = self.client.post(reverse("import_assets"), {"csv_file": upload}, follow=True)
+
+        self.assertRedirects(response, reverse("import_preview"))
+        self.assertEqual((response.context["batch"].valid_rows, response.context["batch"].error_rows), (1, 1))
+        self.assertContains(response, "Invalid device type &#x27;toaster&#x27;")
+        self.assertContains(response, "Invalid location &#x27;Moon Base&#x27;")
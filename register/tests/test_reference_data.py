@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from register.models import DataVersion, DeviceType
+from register.reference_data import VERSION_KEY, reference
+
+from .helpers import reference_rows
+
+
+@override_settings(REFERENCE_DATA_CHECK_INTERVAL=60)
+class ReferenceRegistryTests(TestCase):
+    def setUp(self):
+        self.laptop = reference_rows()["device_type"]
+        self.clock = 1000.0
+        patcher = mock.patch("register.reference_data.time.monotonic", side_effect=lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Check the version on the next read, whatever earlier tests left
+        reference._version = None
+        self.addCleanup(reference.invalidate)
+
+    def rename_elsewhere(self, name):
+        """
+        A rename by another process: no signal here, only its version bump
+        """
+        DeviceType.objects.filter(pk=self.laptop.pk).update(name=name)
+        DataVersion.bump(VERSION_KEY)
+
+    def test_rows_are_served_from_memory_between_checks(self):
+        self.assertEqual(reference.device_types.get(self.laptop.pk).name, "laptop")
+
+        with self.assertNumQueries(0):
+            reference.device_types.get(self.laptop.pk)
+            reference.device_types.by_name("LAPTOP")
+
+    def test_reloads_after_another_process_bumps_the_version(self):
+        self.assertEqual(reference.device_types.get(self.laptop.pk).name, "laptop")
+        self.rename_elsewhere("notebook")
+
+        # Not checked again until the interval has passed
+        self.clock += 30
+        self.assertEqual(reference.device_types.get(self.laptop.pk).name, "laptop")
+
+        self.clock += 31
+        self.assertEqual(reference.device_types.get(self.laptop.pk).name, "notebook")
+        self.assertEqual(reference.device_types.by_name("Notebook").pk, self.laptop.pk)
+        self.assertIsNone(reference.device_types.by_name("laptop"))
+
+    def test_unchanged_version_keeps_the_loaded_rows(self):
+        reference.device_types.all()
+        self.clock += 61
+
+        # One version check, no reload
+        with self.assertNumQueries(1):
+            reference.device_types.all()
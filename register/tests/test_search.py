@@ -0,0 +1,55 @@
+from django.test import TestCase
+
+from register.models import Asset
+from register.utils_search import (
+    FTS_TABLE,
+    FTS5SearchBackend,
+    IContainsSearchBackend,
+    fts_table_exists,
+)
+
+from .helpers import make_asset, reference_rows
+
+TERMS = ["a", "Ab", "abc", "ABC-1", "1", "23", "x9Q", "o'b", 'say "hi"', "ö", "carol", "none-such"]
+
+
+class FTS5SearchTests(TestCase):
+    def setUp(self):
+        if not fts_table_exists():
+            self.skipTest("SQLite without the FTS5 trigram table")
+
+        refs = reference_rows()
+        for serial, staff in [
+            ("ABC-123", "Carol Abbott"),
+            ("abc-124", "Dave O'Brien"),
+            ("X9Q-0001", 'Eve "hi" Ng'),
+            ("Zz-9", "Björn Öberg"),
+            ("ab", ""),
+        ]:
+            make_asset(refs, serial_number=serial, staff_name=staff)
+
+    def test_results_equal_icontains_for_every_term_length(self):
+        fts, plain = FTS5SearchBackend(), IContainsSearchBackend()
+
+        for field in ("serial_number", "staff_name"):
+            for term in TERMS:
+                with self.subTest(field=field, term=term):
+                    self.assertEqual(
+                        set(fts.filter(Asset.objects.all(), field, term)),
+                        set(plain.filter(Asset.objects.all(), field, term)),
+                    )
+
+    def test_only_terms_of_three_characters_or_more_use_the_index(self):
+        fts = FTS5SearchBackend()
+
+        self.assertIn(FTS_TABLE, str(fts.filter(Asset.objects.all(), "serial_number", "abc").query))
+        self.assertNotIn(FTS_TABLE, str(fts.filter(Asset.objects.all(), "serial_number", "ab").query))
+
+    def test_edits_reach_the_index(self):
+        asset = Asset.objects.get(serial_number="Zz-9")
+        asset.staff_name = "Quentin"
+        asset.save()
+
+        self.assertEqual(
+            list(FTS5SearchBackend().filter(Asset.objects.all(), "staff_name", "quent")), [asset]
+        )
@@ -0,0 +1,117 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from register.models import Asset, AuditLog, DeviceType
+from register.utils_import import update_assets, upsert_assets, validate_import
+
+from .helpers import decommissioned_status, make_asset, reference_rows
+
+
+class UpsertTests(TestCase):
+    def setUp(self):
+        self.refs = reference_rows()
+        DeviceType.objects.create(name="desktop")
+        self.asset = make_asset(self.refs, staff_name="Carol")
+        AuditLog.objects.all().delete()
+
+    def row(self, asset=None, **changes):
+        """
+        A validated import row (clean_row keys, canonical names) restating
+        asset, with changes applied
+        """
+        asset = asset or self.asset
+        return {
+            "device_name": asset.device_name,
+            "device_model": asset.device_model,
+            "serial_number": asset.serial_number,
+            "device_type": asset.device_type.name,
+            "status": asset.status.name,
+            "location": asset.location.name,
+            "department": "",
+            "staff_name": asset.staff_name,
+            **changes,
+        }
+
+    def asset_updates(self, queries):
+        table = Asset._meta.db_table
+        return [q["sql"] for q in queries.captured_queries if q["sql"].startswith(f'UPDATE "{table}"')]
+
+    def test_only_changed_fields_are_written(self):
+        with CaptureQueriesContext(connection) as queries:
+            updated = update_assets([self.row(device_type="desktop", staff_name="Dave")], None)
+
+        self.assertEqual(updated, 1)
+        [sql] = self.asset_updates(queries)
+        self.assertIn('"device_type_id"', sql)
+        self.assertIn('"staff_name"', sql)
+        self.assertNotIn('"device_name"', sql)
+        self.assertNotIn('"location_id"', sql)
+
+        self.asset.refresh_from_db()
+        self.assertEqual((self.asset.device_type.name, self.asset.staff_name), ("desktop", "Dave"))
+
+    def test_one_audit_entry_per_changed_field(self):
+        update_assets([self.row(device_type="desktop", staff_name="Dave")], None)
+
+        self.assertEqual(
+            sorted(AuditLog.objects.values_list("action", "field_name", "old_value", "new_value")),
+            [
+                ("updated", "device_type", "laptop", "desktop"),
+                ("updated", "staff_name", "Carol", "Dave"),
+            ],
+        )
+
+    def test_unchanged_row_writes_nothing(self):
+        with CaptureQueriesContext(connection) as queries:
+            updated = update_assets([self.row()], None)
+
+        self.assertEqual(updated, 0)
+        self.assertEqual(self.asset_updates(queries), [])
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_unknown_and_decommissioned_serials_are_not_updated(self):
+        retired = make_asset(self.refs, status=decommissioned_status())
+        self.assertFalse(retired.is_active)
+
+        rows = [
+            self.row(serial_number="UNKNOWN", staff_name="Dave"),
+            self.row(retired, status=self.refs["status"].name, staff_name="Dave"),
+        ]
+        self.assertEqual(update_assets(rows, None), 0)
+        self.assertFalse(Asset.objects.filter(staff_name="Dave").exists())
+
+    def test_preview_rejects_rows_for_decommissioned_assets(self):
+        retired = make_asset(self.refs, status=decommissioned_status())
+        reader = [
+            {
+                "Device Name": "Laptop",
+                "Device Model": "Model",
+                "Serial Number": serial,
+                "Device Type": "laptop",
+                "Status": "in-use",
+                "Location": "Headquarters",
+                "Staff Name": "",
+            }
+            for serial in (self.asset.serial_number, retired.serial_number)
+        ]
+
+        [(_, _, current), (_, _, decommissioned)] = validate_import(reader, upsert=True)
+
+        self.assertEqual(current, [])
+        self.assertEqual(
+            decommissioned,
+            [f"Asset '{retired.serial_number}' is decommissioned and cannot be updated by import"],
+        )
+
+    def test_upsert_updates_registered_serials_and_creates_the_rest(self):
+        created, updated = upsert_assets(
+            [self.row(staff_name="Dave"), self.row(serial_number="NEW-1")], None
+        )
+
+        self.assertEqual((created, updated), (1, 1))
+        self.assertTrue(Asset.objects.filter(serial_number="NEW-1").exists())
+        self.assertEqual(
+            list(AuditLog.objects.order_by("action").values_list("action", flat=True)),
+            ["import", "updated"],
+        )
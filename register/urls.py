@@ -59,7 +59,17 @@ urlpatterns = [
     path('assets/export/', views.export_assets_csv, name='export_assets_csv'),
     path('assets/decommissioned/', views.decommissioned_assets, name='decommissioned_assets'),
     path('assets/decommissioned/export/', views.export_decommissioned_assets_csv, name='export_decommissioned_assets_csv'),
+    path('assets/export/background/', views.start_export_job, {'kind': 'assets'}, name='start_asset_export_job'),
+    path('assets/decommissioned/export/background/', views.start_export_job, {'kind': 'decommissioned'}, name='start_decommissioned_export_job'),
+    path('assets/export/jobs/<int:pk>/', views.export_job_status, name='export_job_status'),
+    path('assets/export/jobs/<int:pk>/download/', views.export_job_download, name='export_job_download'),
     path("history/", views.system_history, name="system_history"),
+    path("history/export/", views.export_audit_log, name="export_audit_log"),
+    path("assets/as-of/", views.register_as_of, name="register_as_of"),
+    path("assets/as-of/export/", views.export_register_as_of, name="export_register_as_of"),
     path("assets/import/", views.import_assets, name="import_assets"),
+    path("assets/import/preview/", views.import_preview, name="import_preview"),
     path("assets/import/confirm/", views.confirm_import, name="confirm_import"),
+    path("assets/import/jobs/<int:pk>/", views.import_job, name="import_job"),
+    path("assets/import/jobs/<int:pk>/status/", views.import_job_status, name="import_job_status"),
 ]
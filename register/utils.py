@@ -1,26 +1,188 @@
 import csv
-from django.http import HttpResponse
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+from .reference_data import VERSION_KEY as REFERENCE_VERSION
+from .utils_cache import query_digest, versioned_cache_key
+from .utils_pagination import keyset_values, normalize_sort, sort_ordering
+from .utils_search import search_assets
 
-def filter_assets(request, queryset):
-    serial_number = request.GET.get("serial_number")
-    device_status = request.GET.get("device_status")
-    device_type = request.GET.get("device_type")
-    staff_name = request.GET.get("staff_name")
+# Dropdown filters: GET parameter -> Asset column
+FACET_FIELDS = {
+    "device_status": "status_id",
+    "device_type": "device_type_id",
+    "location": "location_id",
+    "department": "department_id",
+}
 
-    if serial_number:
-        queryset = queryset.filter(serial_number__icontains=serial_number)
 
-    if device_status:
-        queryset = queryset.filter(status_id=device_status)
+def apply_search_filters(params, queryset):
+    serial_number = params.get("serial_number")
+    staff_name = params.get("staff_name")
 
-    if device_type:
-        queryset = queryset.filter(device_type_id=device_type)
+    if serial_number:
+        queryset = search_assets(queryset, "serial_number", serial_number)
 
     if staff_name:
-        queryset = queryset.filter(staff_name__icontains=staff_name)
+        queryset = search_assets(queryset, "staff_name", staff_name)
+
+    return queryset
+
+
+def apply_facet_filters(params, queryset):
+    for param, column in FACET_FIELDS.items():
+        value = params.get(param)
+        if value:
+            queryset = queryset.filter(**{column: value})
 
     return queryset
 
+
+def apply_asset_filters(params, queryset):
+    """
+    Search, dropdown filters and sort from a QueryDict (or plain dict)
+    """
+    queryset = apply_search_filters(params, queryset)
+    queryset = apply_facet_filters(params, queryset)
+
+    # Sort by the selected (indexed) column, id as tiebreaker
+    sort = normalize_sort(params.get("sort"))
+    queryset = queryset.order_by(*sort_ordering(sort))
+
+    return queryset
+
+
+def filter_assets(request, queryset):
+    return apply_asset_filters(request.GET, queryset)
+
+
+def asset_facets(request, queryset):
+    """
+    Counts per status, device type, location and department for the
+    current filters, as {param: {id: count}}.
+
+    One GROUP BY over all four columns is rolled up in Python. Each facet
+    ignores its own selection (but honours the others), so the dropdown
+    still shows how many rows each alternative would return. Results are
+    cached per filter combination until assets change.
+    """
+    base = apply_search_filters(request.GET, queryset)
+    selected = {
+        param: request.GET[param]
+        for param in FACET_FIELDS
+        if request.GET.get(param)
+    }
+
+    def compute():
+        rows = (
+            base.order_by()
+            .values_list(*FACET_FIELDS.values())
+            .annotate(count=Count("id"))
+        )
+        counts = {param: Counter() for param in FACET_FIELDS}
+
+        for *values, count in rows:
+            row = dict(zip(FACET_FIELDS, values))
+            for param in FACET_FIELDS:
+                if all(
+                    str(row[other]) == value
+                    for other, value in selected.items()
+                    if other != param
+                ):
+                    counts[param][row[param]] += count
+
+        return {param: dict(counter) for param, counter in counts.items()}
+
+    key = versioned_cache_key(
+        "facets", query_digest(base), selected, models=[queryset.model]
+    )
+    return cache.get_or_set(key, compute, getattr(settings, "FACET_CACHE_TIMEOUT", 600))
+
+
+def facet_options(objects, counts):
+    """
+    Pair reference rows with their facet count for the filter dropdowns
+    """
+    return [(obj, counts.get(obj.pk, 0)) for obj in objects]
+
+
+def list_cache_params(request):
+    """
+    The query string reduced to what changes a list page: blank values
+    dropped, whitespace stripped, keys sorted, sort key normalized. A
+    blank cursor is kept: its presence alone selects keyset paging (see
+    paginate_queryset).
+    """
+    params = sorted(
+        (key, value.strip())
+        for key, values in request.GET.lists()
+        for value in values
+        if (value.strip() or key == "cursor") and key != "sort"
+    )
+    params.append(("sort", normalize_sort(request.GET.get("sort"))))
+    return params
+
+
+def user_role(request):
+    profile = getattr(request.user, "profile", None)
+    return profile.role if profile else None
+
+
+def wants_fragment(request):
+    """
+    True for the in-page list updates, which only need rows and pagination
+    """
+    return request.headers.get("x-requested-with") == "XMLHttpRequest"
+
+
+def cached_list_results(request, name, rows_template, build, model):
+    """
+    Rendered table rows and pagination for a list page, as
+    {"rows": html, "pagination": html}.
+
+    build() returns the template context (it runs the filtered query,
+    count and page fetch) and is only called on a cache miss. Entries are
+    keyed by list name, normalized query string and role, plus the data
+    versions of the model and the reference tables, so any write serves
+    the next request a fresh render.
+    """
+    key = versioned_cache_key(
+        f"list:{name}",
+        list_cache_params(request),
+        user_role(request),
+        models=[model],
+        keys=[REFERENCE_VERSION],
+    )
+    results = cache.get(key)
+
+    if results is None:
+        context = build()
+        results = {
+            "rows": render_to_string(rows_template, context, request),
+            "pagination": render_to_string(
+                "register/partials/pagination.html", context, request
+            ),
+        }
+        cache.set(key, results, getattr(settings, "LIST_CACHE_TIMEOUT", 300))
+
+    return results
+
+
+# Asset fields whose edits are written to the audit log, one entry each
+TRACKED_FIELDS = (
+    "device_name",
+    "device_model",
+    "device_type",
+    "status",
+    "location",
+    "department",
+    "staff_name",
+)
+
+
 def log_asset_action(user, asset, action, field_name=None, old_value=None, new_value=None):
     """
     Logs an action performed on an asset.
@@ -30,45 +192,79 @@ def log_asset_action(user, asset, action, field_name=None, old_value=None, new_v
     :param field_name: Optional field name that was changed
     :param old_value: Optional old value
     :param new_value: Optional new value
+
+    Inside utils_audit.buffered_audit() the entry is written with the
+    block's other audit entries before it exits; otherwise straight away.
     """
     from .models import AuditLog
-    AuditLog.objects.create(
-        user=user,
-        asset=asset,
-        action=action,
-        field_name=field_name,
-        old_value=old_value,
-        new_value=new_value
-    )
-    
-def export_assets_to_csv(queryset):
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="assets.csv"'
+    from .utils_audit import buffer_audit_entries
 
-    writer = csv.writer(response)
-    writer.writerow([
-        "Device Name",
-        "Device Model",
-        "Serial Number",
-        "Device Type",
-        "Status",
-        "Location",
-        "Department",
-        "Staff Name",
-        "Date Modified",
+    buffer_audit_entries([
+        AuditLog(
+            user=user,
+            asset=asset,
+            action=action,
+            field_name=field_name,
+            old_value=old_value,
+            new_value=new_value
+        )
     ])
+    
+# Export columns: header -> Asset field, reference names joined in SQL
+EXPORT_COLUMNS = [
+    ("Device Name", "device_name"),
+    ("Device Model", "device_model"),
+    ("Serial Number", "serial_number"),
+    ("Device Type", "device_type__name"),
+    ("Status", "status__name"),
+    ("Location", "location__name"),
+    ("Department", "department__name"),
+    ("Staff Name", "staff_name"),
+    ("Date Modified", "updated_at"),
+]
+
+
+def export_rows(queryset, chunk_size=None, keyset=False):
+    """
+    Yield flat tuples of the EXPORT_COLUMNS values.
+
+    One query with the reference tables joined, read in chunks (a
+    server-side cursor on PostgreSQL), so memory stays flat however many
+    rows are exported. keyset=True reads newest first in separate keyset
+    queries instead, so no cursor stays open between chunks; background
+    jobs use it because they write progress while exporting, which SQLite
+    refuses on a connection with an open read.
+    """
+    chunk_size = chunk_size or getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+    fields = [field for _, field in EXPORT_COLUMNS]
+
+    if keyset:
+        return keyset_values(queryset, ("-id",), fields, chunk_size)
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+
 
-    for asset in queryset:
-        writer.writerow([
-            asset.device_name,
-            asset.device_model,
-            asset.serial_number,
-            asset.device_type.name if asset.device_type else "",
-            asset.status.name if asset.status else "",
-            asset.location.name if asset.location else "",
-            asset.department.name if asset.department else "",
-            asset.staff_name,
-            asset.updated_at.strftime("%Y-%m-%d %H:%M") if asset.updated_at else "",
+class Echo:
+    """
+    File-like object for csv.writer that hands each line back instead of
+    buffering it
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(queryset, keyset=False):
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+
+    for *values, updated_at in export_rows(queryset, keyset=keyset):
+        yield writer.writerow([
+            *("" if value is None else value for value in values),
+            updated_at.strftime("%Y-%m-%d %H:%M") if updated_at else "",
         ])
 
+
+def export_assets_to_csv(queryset):
+    response = StreamingHttpResponse(csv_lines(queryset), content_type="text/csv")
+    response["Content-Disposition"] = 'attachment; filename="assets.csv"'
     return response
@@ -0,0 +1,305 @@
+import csv
+import heapq
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import DateTimeField, Value
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import AuditLog, AuditLogArchive, DataVersion
+from .signals import AUDIT_DATA_VERSION
+from .utils import Echo
+from .utils_pagination import MergedCursorPaginator, keyset_condition, keyset_values
+
+
+# Audit export columns: header -> AuditLog field, user and asset joined in SQL
+AUDIT_EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("timestamp", "timestamp"),
+    ("user", "user__username"),
+    ("action", "action"),
+    ("asset_id", "asset_id"),
+    ("serial_number", "asset__serial_number"),
+    ("device_name", "asset__device_name"),
+    ("field_name", "field_name"),
+    ("old_value", "old_value"),
+    ("new_value", "new_value"),
+]
+
+# Oldest first, id as tiebreaker; served by the (timestamp, id) index
+AUDIT_EXPORT_ORDERING = ("timestamp", "id")
+
+# Audit listings: newest first, keyset-paged over the same indexes
+AUDIT_LIST_ORDERING = ("-timestamp", "-id")
+
+# Rows per INSERT when a transaction's buffered entries are flushed
+AUDIT_FLUSH_BATCH_SIZE = 1000
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def apply_audit_filters(params, queryset):
+    """
+    Filter audit entries by date range (date_from/date_to as YYYY-MM-DD,
+    both inclusive), username, action, field name, asset id and asset
+    serial number
+    """
+    date_from = parse_date(params.get("date_from"))
+    date_to = parse_date(params.get("date_to"))
+
+    if date_from:
+        queryset = queryset.filter(timestamp__gte=day_start(date_from))
+
+    if date_to:
+        queryset = queryset.filter(timestamp__lt=day_start(date_to + timedelta(days=1)))
+
+    if params.get("user"):
+        queryset = queryset.filter(user__username=params["user"])
+
+    if params.get("action"):
+        queryset = queryset.filter(action=params["action"])
+
+    if params.get("field_name"):
+        queryset = queryset.filter(field_name=params["field_name"])
+
+    if params.get("asset", "").isdigit():
+        queryset = queryset.filter(asset_id=params["asset"])
+
+    if params.get("serial_number"):
+        queryset = queryset.filter(asset__serial_number=params["serial_number"])
+
+    return queryset
+
+
+def audit_sources(params):
+    """
+    The archived and the hot audit entries, each with the filters applied.
+    Archived rows keep their AuditLog id, so (timestamp, id) stays unique
+    across both.
+    """
+    return [apply_audit_filters(params, model.objects.all()) for model in (AuditLogArchive, AuditLog)]
+
+
+def audit_page(request, per_page=20):
+    """
+    One keyset page of the filtered audit entries (hot and archived),
+    newest first.
+
+    Each filter has an index leading with its column and ending in
+    (timestamp, id), so a page costs an index range scan per table
+    however large they are.
+    """
+    querysets = [queryset.select_related("asset", "user") for queryset in audit_sources(request.GET)]
+    paginator = MergedCursorPaginator(querysets, per_page, AUDIT_LIST_ORDERING)
+    return paginator.get_page(request.GET.get("cursor"))
+
+
+def audit_rows(querysets):
+    """
+    Yield AUDIT_EXPORT_COLUMNS tuples for every entry of the querysets,
+    oldest first, merging one keyset iteration over (timestamp, id) per
+    queryset
+    """
+    columns = [field for _, field in AUDIT_EXPORT_COLUMNS]
+    chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+    return heapq.merge(
+        *(keyset_values(queryset, AUDIT_EXPORT_ORDERING, columns, chunk_size) for queryset in querysets),
+        key=lambda row: (row[1], row[0]),
+    )
+
+
+def _serializable(row):
+    return [value.isoformat() if isinstance(value, datetime) else value for value in row]
+
+
+def audit_csv_lines(querysets):
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in AUDIT_EXPORT_COLUMNS])
+
+    for row in audit_rows(querysets):
+        yield writer.writerow(_serializable(row))
+
+
+def audit_jsonl_lines(querysets):
+    headers = [header for header, _ in AUDIT_EXPORT_COLUMNS]
+
+    for row in audit_rows(querysets):
+        yield json.dumps(dict(zip(headers, _serializable(row)))) + "\n"
+
+
+def audit_log_response(querysets, export_format="csv"):
+    if export_format == "jsonl":
+        lines, content_type, extension = audit_jsonl_lines, "application/x-ndjson", "jsonl"
+    else:
+        lines, content_type, extension = audit_csv_lines, "text/csv", "csv"
+
+    response = StreamingHttpResponse(lines(querysets), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="audit_log.{extension}"'
+    return response
+
+
+# ---------- Buffered audit writes ----------
+class AuditBuffer:
+    """
+    AuditLog entries logged inside one buffered_audit() block, written
+    with one bulk_create before the block exits
+    """
+
+    def __init__(self, savepoint_ids):
+        self.savepoint_ids = savepoint_ids
+        self.entries = []
+
+    def flush(self):
+        AuditLog.objects.bulk_create(self.entries, batch_size=AUDIT_FLUSH_BATCH_SIZE)
+        self.entries = []
+
+
+# Open buffered_audit() blocks of this thread, innermost last
+_buffers = threading.local()
+
+
+def _buffer_stack():
+    if not hasattr(_buffers, "stack"):
+        _buffers.stack = []
+    return _buffers.stack
+
+
+@contextmanager
+def buffered_audit(using=None):
+    """
+    transaction.atomic() whose audit entries (log_asset_action,
+    buffer_audit_entries) are collected and written with one bulk_create
+    at the end of the block, still inside its transaction, so the data
+    never commits without its audit rows. Nothing is written if the block
+    raises.
+    """
+    with transaction.atomic(using=using):
+        connection = transaction.get_connection(using)
+        buffer = AuditBuffer(list(connection.savepoint_ids))
+        stack = _buffer_stack()
+        stack.append(buffer)
+
+        try:
+            yield buffer
+        finally:
+            stack.remove(buffer)
+
+        buffer.flush()
+
+
+def buffer_audit_entries(entries):
+    """
+    Add unsaved AuditLog entries to the innermost buffered_audit() block,
+    or write them straight away (in the current transaction, if any).
+
+    Entries logged inside a nested atomic() block that has its own
+    savepoint are written at once, so they roll back with it.
+    """
+    stack = _buffer_stack()
+    connection = transaction.get_connection()
+
+    if stack and connection.in_atomic_block and stack[-1].savepoint_ids == connection.savepoint_ids:
+        stack[-1].entries.extend(entries)
+        return
+
+    AuditLog.objects.bulk_create(entries, batch_size=AUDIT_FLUSH_BATCH_SIZE)
+
+
+# ---------- Archival ----------
+ARCHIVE_COLUMNS = (
+    "id",
+    "asset_id",
+    "user_id",
+    "action",
+    "field_name",
+    "old_value",
+    "new_value",
+    "timestamp",
+)
+
+
+def archive_audit_log(before, batch_size=None):
+    """
+    Move AuditLog rows older than before into AuditLogArchive, oldest
+    first. Each batch of batch_size rows is one transaction: an INSERT
+    ... SELECT into the archive and a DELETE of the same rows, both
+    bounded by the batch's last (timestamp, id) key rather than a list of
+    ids. Returns the number of rows moved.
+    """
+    batch_size = batch_size or getattr(settings, "AUDIT_ARCHIVE_BATCH_SIZE", 5000)
+    qn = connection.ops.quote_name
+    fields = [(field, False) for field in AUDIT_EXPORT_ORDERING]
+    moved = 0
+
+    while True:
+        with transaction.atomic():
+            expired = AuditLog.objects.filter(timestamp__lt=before).order_by()
+
+            last = (
+                expired.order_by(*AUDIT_EXPORT_ORDERING)
+                .values_list(*AUDIT_EXPORT_ORDERING)[batch_size - 1: batch_size]
+                .first()
+            )
+            if last is not None:
+                # Everything up to and including the batch's last key
+                expired = expired.filter(~keyset_condition(AuditLog, fields, last))
+
+            rows = expired.annotate(
+                archived_at=Value(timezone.now(), output_field=DateTimeField())
+            ).values_list(*ARCHIVE_COLUMNS, "archived_at")
+            select_sql, select_params = rows.query.sql_with_params()
+            ids_sql, ids_params = expired.values("id").query.sql_with_params()
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {qn(AuditLogArchive._meta.db_table)} "
+                    f"({', '.join(ARCHIVE_COLUMNS)}, archived_at) {select_sql}",
+                    select_params,
+                )
+                count = cursor.rowcount
+
+                cursor.execute(
+                    f"DELETE FROM {qn(AuditLog._meta.db_table)} WHERE id IN ({ids_sql})",
+                    ids_params,
+                )
+
+            if count:
+                DataVersion.bump_on_commit(AUDIT_DATA_VERSION)
+
+        moved += count
+        if last is None:
+            return moved
+
+
+def archive_cutoff(days=None):
+    days = getattr(settings, "AUDIT_ARCHIVE_AFTER_DAYS", 365) if days is None else days
+    return timezone.now() - timedelta(days=days)
+
+
+def asset_history_entries(asset):
+    """
+    An asset's hot and archived audit entries, oldest first
+    """
+    def entries(model):
+        return model.objects.filter(asset=asset).select_related("user").order_by("timestamp", "id")
+
+    return list(heapq.merge(
+        entries(AuditLogArchive),
+        entries(AuditLog),
+        key=lambda entry: (entry.timestamp, entry.id),
+    ))
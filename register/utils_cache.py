@@ -0,0 +1,60 @@
+import hashlib
+import json
+
+from django.utils import timezone
+
+from .models_cache import DataVersion
+from .signals import version_key_for
+
+
+def query_digest(queryset):
+    """
+    Stable digest of the SQL a queryset would run (ordering ignored)
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    return hashlib.md5(f"{sql}|{params!r}".encode()).hexdigest()
+
+
+def versioned_cache_key(prefix, *parts, models=(), keys=()):
+    """
+    Cache key for data derived from the given models. It embeds their
+    current DataVersion (plus any extra version keys), so any write to
+    those tables moves readers to a fresh key and stale entries simply
+    expire.
+    """
+    keys = [version_key_for(model) for model in models] + list(keys)
+    versions = [DataVersion.get_version(key) for key in keys]
+    digest = hashlib.md5(
+        json.dumps([parts, versions], default=str, sort_keys=True).encode()
+    ).hexdigest()
+    return f"register:{prefix}:{digest}"
+
+
+def data_validators(keys, daily=False):
+    """
+    (etag, last_modified) for a response derived from the given DataVersion
+    keys, read in a single query.
+
+    daily=True is for responses with date-relative figures ("this month",
+    "last 30 days"): the day becomes part of the ETag and Last-Modified is
+    never earlier than midnight, so they also change once a day.
+    """
+    rows = DataVersion.objects.filter(key__in=keys).values_list(
+        "key", "version", "updated_at"
+    )
+    versions = {key: 0 for key in keys}
+    last_modified = None
+
+    for key, version, updated_at in rows:
+        versions[key] = version
+        if last_modified is None or updated_at > last_modified:
+            last_modified = updated_at
+
+    parts = sorted(versions.items())
+    if daily:
+        midnight = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        parts.append(("day", midnight.date().isoformat()))
+        last_modified = max(last_modified or midnight, midnight)
+
+    digest = hashlib.md5(json.dumps(parts).encode()).hexdigest()
+    return f'W/"{digest}"', last_modified
@@ -3,24 +3,17 @@ from django.utils import timezone
 from datetime import timedelta, date
 from collections import Counter
 import json
+from .reference_data import reference
 
 
 def get_dashboard_stats():
     """
     Get comprehensive dashboard statistics
     """
-    from .models import Asset, DeviceStatus, DeviceType, Department, AuditLog
-    
-    # Get decommissioned status
-    try:
-        decommissioned_status = DeviceStatus.objects.get(name__iexact='decommissioned')
-    except DeviceStatus.DoesNotExist:
-        decommissioned_status = None
+    from .models import Asset, AuditLog
     
     # Active assets (excluding decommissioned)
-    active_assets = Asset.objects.all()
-    if decommissioned_status:
-        active_assets = active_assets.exclude(status=decommissioned_status)
+    active_assets = Asset.objects.active()
     
     # Total counts
     total_assets = Asset.objects.count()
@@ -134,22 +127,13 @@ def get_department_analytics():
     """
     Get detailed analytics per department
     """
-    from .models import Asset, Department, DeviceStatus
-    
-    try:
-        decommissioned_status = DeviceStatus.objects.get(name__iexact='decommissioned')
-    except DeviceStatus.DoesNotExist:
-        decommissioned_status = None
+    from .models import Asset
     
-    departments = Department.objects.all()
+    departments = reference.departments.all()
     analytics = []
     
     for dept in departments:
-        assets = Asset.objects.filter(department=dept)
-        if decommissioned_status:
-            active_assets = assets.exclude(status=decommissioned_status)
-        else:
-            active_assets = assets
+        active_assets = Asset.objects.active().filter(department=dept)
         
         # Device types in this department
         device_types = list(
@@ -217,13 +201,9 @@ def get_asset_utilization():
     """
     Calculate asset utilization metrics
     """
-    from .models import Asset, DeviceStatus
+    from .models import Asset
     
-    try:
-        decommissioned_status = DeviceStatus.objects.get(name__iexact='decommissioned')
-        active_assets = Asset.objects.exclude(status=decommissioned_status)
-    except DeviceStatus.DoesNotExist:
-        active_assets = Asset.objects.all()
+    active_assets = Asset.objects.active()
     
     total_active = active_assets.count()
     
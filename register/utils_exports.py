@@ -0,0 +1,420 @@
+import gzip
+import logging
+import os
+import re
+import zipfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Asset, ExportJob
+from .reference_data import reference
+from .utils import EXPORT_COLUMNS, apply_asset_filters, csv_lines, export_rows
+from .utils_jobs import enqueue_job, run_queued_jobs
+
+logger = logging.getLogger(__name__)
+
+
+def export_queryset(kind, params):
+    """
+    The assets an export job covers, with the list filters applied
+    """
+    if kind == ExportJob.KIND_DECOMMISSIONED:
+        queryset = Asset.objects.decommissioned()
+    else:
+        queryset = Asset.objects.active()
+
+    # Stored as {param: [values]}; the filters read single values
+    params = {key: values[-1] for key, values in params.items() if values}
+    return apply_asset_filters(params, queryset)
+
+
+def run_export_job(job):
+    """
+    Write a claimed job's CSV to EXPORT_ROOT as gzip, reporting progress
+    every EXPORT_PROGRESS_INTERVAL rows (which is also the job's
+    heartbeat). The file appears under its final name only once it is
+    complete.
+    """
+    interval = getattr(settings, "EXPORT_PROGRESS_INTERVAL", 5000)
+    partial_path = f"{job.path}.part"
+    rows_written = 0
+
+    os.makedirs(settings.EXPORT_ROOT, exist_ok=True)
+
+    try:
+        lines = csv_lines(export_queryset(job.kind, job.params), keyset=True)
+
+        with gzip.open(partial_path, "wt", encoding="utf-8", newline="") as output:
+            output.write(next(lines))  # header
+
+            for line in lines:
+                output.write(line)
+                rows_written += 1
+
+                if rows_written % interval == 0:
+                    ExportJob.objects.filter(pk=job.pk).update(
+                        rows_written=rows_written, heartbeat_at=timezone.now()
+                    )
+
+        os.replace(partial_path, job.path)
+
+    except Exception as exc:
+        logger.exception("Export job %s failed", job.pk)
+
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+        job.status = ExportJob.STATUS_FAILED
+        job.error = str(exc)
+    else:
+        job.status = ExportJob.STATUS_DONE
+
+    job.rows_written = rows_written
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "rows_written", "finished_at"])
+    return job
+
+
+def tidy_export_jobs():
+    fail_stalled_exports()
+    return purge_expired_exports()
+
+
+def enqueue_export_job(job):
+    """
+    Start the job once the request's transaction commits.
+
+    EXPORT_JOB_RUNNER = "thread" runs it in a background thread of the web
+    process; "worker" leaves it queued for manage.py run_export_jobs.
+    """
+    enqueue_job(job, run_export_job, "EXPORT_JOB_RUNNER", then=tidy_export_jobs)
+
+
+def run_queued_export_jobs():
+    """
+    Run queued jobs until none are left, after failing stalled ones.
+    Returns how many were run.
+    """
+    fail_stalled_exports()
+    return run_queued_jobs(ExportJob, run_export_job)
+
+
+def fail_stalled_exports(jobs=None):
+    """
+    Mark stalled running jobs (see ExportJob.stalled) as failed, so their
+    status stops reading "running" and the page stops polling. Returns how
+    many were marked.
+    """
+    jobs = ExportJob.stalled() if jobs is None else jobs
+    return jobs.filter(status=ExportJob.STATUS_RUNNING).update(
+        status=ExportJob.STATUS_FAILED,
+        error="The export stopped before finishing; please start it again.",
+        finished_at=timezone.now(),
+    )
+
+
+def purge_expired_exports():
+    """
+    Delete finished jobs and their files (or the partial file of a failed
+    one) after EXPORT_RETENTION_HOURS
+    """
+    hours = getattr(settings, "EXPORT_RETENTION_HOURS", 24)
+    expired = ExportJob.objects.filter(
+        created_at__lt=timezone.now() - timedelta(hours=hours)
+    ).exclude(status__in=[ExportJob.STATUS_QUEUED, ExportJob.STATUS_RUNNING])
+
+    for job in expired:
+        for path in (job.path, f"{job.path}.part"):
+            if job.file_name and os.path.exists(path):
+                os.remove(path)
+
+    return expired.delete()[0]
+
+
+# ---------- File formats ----------
+class ChunkSink:
+    """
+    Write-only file object that collects output until drain() hands it to
+    the response, so archive/columnar writers can stream
+    """
+    closed = False
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+# ----- Parquet / Arrow IPC (optional pyarrow) -----
+# Asset column -> reference table; exported dictionary-encoded by name
+DICTIONARY_COLUMNS = {
+    "device_type_id": reference.device_types,
+    "status_id": reference.statuses,
+    "location_id": reference.locations,
+    "department_id": reference.departments,
+}
+
+COLUMNAR_FIELDS = [
+    "id",
+    "device_name",
+    "device_model",
+    "serial_number",
+    "device_type_id",
+    "status_id",
+    "location_id",
+    "department_id",
+    "staff_name",
+    "created_at",
+    "updated_at",
+]
+
+
+def arrow_schema():
+    import pyarrow as pa
+
+    category = pa.dictionary(pa.int32(), pa.string())
+    timestamp = pa.timestamp("us", tz="UTC")
+
+    return pa.schema([
+        ("id", pa.int64()),
+        ("device_name", pa.string()),
+        ("device_model", pa.string()),
+        ("serial_number", pa.string()),
+        ("device_type", category),
+        ("status", category),
+        ("location", category),
+        ("department", category),
+        ("staff_name", pa.string()),
+        ("created_at", timestamp),
+        ("updated_at", timestamp),
+    ])
+
+
+def arrow_batches(queryset, batch_size=None):
+    """
+    Yield pyarrow RecordBatches of the export.
+
+    Foreign keys are read as plain ids and mapped onto dictionaries built
+    once from the reference registry, so names are neither joined in SQL
+    nor repeated per row.
+    """
+    import pyarrow as pa
+
+    batch_size = batch_size or getattr(settings, "EXPORT_COLUMNAR_BATCH_SIZE", 50000)
+    schema = arrow_schema()
+
+    dictionaries = {}
+    for column, table in DICTIONARY_COLUMNS.items():
+        rows = table.all()
+        dictionaries[column] = (
+            pa.array([row.name for row in rows], type=pa.string()),
+            {row.pk: index for index, row in enumerate(rows)},
+        )
+
+    rows = queryset.values_list(*COLUMNAR_FIELDS).iterator(
+        chunk_size=getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+    )
+
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+
+        columns = list(zip(*chunk))
+        arrays = []
+
+        for field, values in zip(COLUMNAR_FIELDS, columns):
+            if field in dictionaries:
+                dictionary, positions = dictionaries[field]
+                indices = pa.array([positions.get(value) for value in values], type=pa.int32())
+                arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+            else:
+                arrays.append(pa.array(values, type=schema.field(len(arrays)).type))
+
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def parquet_chunks(queryset):
+    import pyarrow.parquet as pq
+
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, arrow_schema(), compression="snappy")
+
+    for batch in arrow_batches(queryset):
+        writer.write_batch(batch)
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+
+def arrow_chunks(queryset):
+    import pyarrow as pa
+
+    sink = ChunkSink()
+    writer = pa.ipc.new_stream(sink, arrow_schema())
+
+    for batch in arrow_batches(queryset):
+        writer.write_batch(batch)
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+
+# ----- XLSX -----
+XLSX_STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Assets" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    # Style 0: default, style 1: date and time (built-in format 22)
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '</cellXfs>'
+        '</styleSheet>'
+    ),
+}
+
+XLSX_EPOCH = datetime(1899, 12, 30)
+
+# Characters XML 1.0 does not allow
+XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def xlsx_cell(value):
+    if value is None or value == "":
+        return "<c/>"
+
+    if isinstance(value, datetime):
+        value = timezone.make_naive(value, dt_timezone.utc) if timezone.is_aware(value) else value
+        # Day fractions; ten places keep the time to the millisecond
+        serial = (value - XLSX_EPOCH).total_seconds() / 86400
+        return f'<c s="1"><v>{serial:.10f}</v></c>'
+
+    if isinstance(value, (int, float)):
+        return f"<c><v>{value}</v></c>"
+
+    text = escape(XML_ILLEGAL.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def xlsx_chunks(queryset, flush_every=1000):
+    """
+    The CSV columns as an XLSX workbook, streamed.
+
+    Cells use inline strings (no shared-string table to hold in memory)
+    and the zip is written without seeking, so the workbook is produced
+    row by row with flat memory. Dates are real Excel dates.
+    """
+    sink = ChunkSink()
+
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield sink.drain()
+
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            header = "".join(xlsx_cell(title) for title, _ in EXPORT_COLUMNS)
+            sheet.write(
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                f"<sheetData><row>{header}</row>".encode()
+            )
+
+            for count, row in enumerate(export_rows(queryset), start=1):
+                cells = "".join(xlsx_cell(value) for value in row)
+                sheet.write(f"<row>{cells}</row>".encode())
+
+                if count % flush_every == 0:
+                    yield sink.drain()
+
+            sheet.write(b"</sheetData></worksheet>")
+
+    yield sink.drain()
+
+
+# Export format -> (content generator, content type, file extension)
+EXPORT_FORMATS = {
+    "xlsx": (
+        xlsx_chunks,
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "xlsx",
+    ),
+    "parquet": (parquet_chunks, "application/vnd.apache.parquet", "parquet"),
+    "arrow": (arrow_chunks, "application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Formats that need the optional pyarrow package
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+
+def columnar_export_available():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export_file_response(queryset, export_format, basename="assets"):
+    chunks, content_type, extension = EXPORT_FORMATS[export_format]
+
+    response = StreamingHttpResponse(chunks(queryset), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{basename}.{extension}"'
+    return response
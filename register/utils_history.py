@@ -0,0 +1,255 @@
+import csv
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Asset, AuditLog, AuditLogArchive, CheckpointAsset, RegisterCheckpoint
+from .reference_data import reference
+from .utils import TRACKED_FIELDS, Echo
+from .utils_audit import day_start
+from .utils_import import batches
+from .utils_pagination import CursorPage, keyset_values
+
+
+# Asset fields whose changes the audit log records ("updated" entries)
+STATE_FIELDS = TRACKED_FIELDS
+
+# Keys of a reconstructed asset state (and CheckpointAsset columns)
+STATE_KEYS = ("asset_id", "serial_number", "created_at", *STATE_FIELDS)
+
+REFERENCE_TABLES = {
+    "device_type": reference.device_types,
+    "status": reference.statuses,
+    "location": reference.locations,
+    "department": reference.departments,
+}
+
+# Asset columns read for a live state, reference ids in REFERENCE_TABLES order
+LIVE_COLUMNS = (
+    "id",
+    "serial_number",
+    "created_at",
+    "device_name",
+    "device_model",
+    "device_type_id",
+    "status_id",
+    "location_id",
+    "department_id",
+    "staff_name",
+)
+
+AS_OF_EXPORT_COLUMNS = [
+    ("Device Name", "device_name"),
+    ("Device Model", "device_model"),
+    ("Serial Number", "serial_number"),
+    ("Device Type", "device_type"),
+    ("Status", "status"),
+    ("Location", "location"),
+    ("Department", "department"),
+    ("Staff Name", "staff_name"),
+    ("Date Created", "created_at"),
+]
+
+
+def audit_text(value):
+    """
+    A value as the audit log writes it (str() of the field), with None,
+    which was logged as "None", as blank
+    """
+    return "" if value is None or value == "None" else str(value)
+
+
+def live_state(row):
+    """
+    State dict for a LIVE_COLUMNS row, references as their display text
+    """
+    asset_id, serial_number, created_at, device_name, device_model, *reference_ids, staff_name = row
+
+    state = {
+        "asset_id": asset_id,
+        "serial_number": serial_number,
+        "created_at": created_at,
+        "device_name": device_name,
+        "device_model": device_model,
+        "staff_name": audit_text(staff_name),
+    }
+    for (field, table), pk in zip(REFERENCE_TABLES.items(), reference_ids):
+        state[field] = audit_text(table.get(pk))
+
+    return state
+
+
+def take_checkpoint(chunk_size=None):
+    """
+    Copy every asset's current state into a new RegisterCheckpoint, in
+    keyset chunks with one bulk_create each.
+
+    taken_at is set when the copy finishes. A change made while copying
+    then falls inside the (date, taken_at] range that reconstruction
+    undoes, so the checkpoint stays consistent without a long transaction.
+    """
+    chunk_size = chunk_size or getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+    checkpoint = RegisterCheckpoint.objects.create()
+    count = 0
+
+    rows = keyset_values(Asset.objects.all(), ("id",), LIVE_COLUMNS, chunk_size)
+    for chunk in batches(rows, chunk_size):
+        CheckpointAsset.objects.bulk_create(
+            [CheckpointAsset(checkpoint=checkpoint, **live_state(row)) for row in chunk]
+        )
+        count += len(chunk)
+
+    checkpoint.taken_at = timezone.now()
+    checkpoint.asset_count = count
+    checkpoint.save(update_fields=["taken_at", "asset_count"])
+    return checkpoint
+
+
+def nearest_checkpoint(when):
+    """
+    The first finished checkpoint at or after when, or None (start from
+    the live table)
+    """
+    return (
+        RegisterCheckpoint.objects.filter(taken_at__gte=when)
+        .order_by("taken_at")
+        .first()
+    )
+
+
+def undo_changes(states, when, until=None):
+    """
+    Roll states back to when: every "updated" entry of these assets from
+    when up to until (the checkpoint, or now) is undone, newest first, so
+    each field ends at the value it had before its first change after
+    when. One indexed (asset, timestamp) query per audit table.
+    """
+    by_id = {state["asset_id"]: state for state in states}
+    entries = []
+
+    for model in (AuditLogArchive, AuditLog):
+        changes = model.objects.filter(
+            asset_id__in=list(by_id),
+            action="updated",
+            field_name__in=STATE_FIELDS,
+            timestamp__gte=when,
+        )
+        if until is not None:
+            changes = changes.filter(timestamp__lte=until)
+
+        entries.extend(
+            changes.order_by().values_list("timestamp", "id", "asset_id", "field_name", "old_value")
+        )
+
+    for _, _, asset_id, field, old_value in sorted(entries, reverse=True):
+        by_id[asset_id][field] = audit_text(old_value)
+
+    return states
+
+
+def end_of_day(day):
+    """
+    The register "as of" a date is its state at the end of that day
+    """
+    return day_start(day + timedelta(days=1))
+
+
+def register_as_of(when, serial_number=None, after=None, limit=None, chunk_size=None):
+    """
+    Yield the state of every asset that existed at when, in asset id
+    order (those after the id after, at most limit of them).
+
+    Starts from the nearest checkpoint taken after when, or from the live
+    table if there is none, and undoes only the audit entries between
+    when and that starting point, chunk by chunk.
+    """
+    chunk_size = chunk_size or getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+    if limit is not None:
+        chunk_size = min(chunk_size, limit)
+
+    checkpoint = nearest_checkpoint(when)
+
+    if checkpoint is not None:
+        base = CheckpointAsset.objects.filter(checkpoint=checkpoint, created_at__lt=when)
+        key, columns, until = "asset_id", STATE_KEYS, checkpoint.taken_at
+
+        def to_state(row):
+            return dict(zip(STATE_KEYS, row))
+    else:
+        base = Asset.objects.filter(created_at__lt=when)
+        key, columns, until, to_state = "id", LIVE_COLUMNS, None, live_state
+
+    if serial_number:
+        base = base.filter(serial_number=serial_number)
+    if after is not None:
+        base = base.filter(**{f"{key}__gt": after})
+
+    rows = keyset_values(base, (key,), columns, chunk_size)
+    if limit is not None:
+        rows = islice(rows, limit)
+
+    for chunk in batches(rows, chunk_size):
+        yield from undo_changes([to_state(row) for row in chunk], when, until)
+
+
+def as_of_page(when, per_page, cursor=None, serial_number=None):
+    """
+    One forward-only CursorPage of register_as_of; the cursor is the last
+    asset id shown. One extra state is reconstructed to know whether more
+    follow.
+    """
+    try:
+        after = int(cursor) if cursor else None
+    except ValueError:
+        after = None
+
+    states = list(register_as_of(when, serial_number=serial_number, after=after, limit=per_page + 1))
+    next_cursor = states[per_page - 1]["asset_id"] if len(states) > per_page else None
+
+    return CursorPage(
+        states[:per_page],
+        next_cursor=next_cursor,
+        # Back to the first page; keyset ids don't run backwards cheaply
+        previous_cursor="" if after is not None else None,
+    )
+
+
+def as_of_csv_lines(when, serial_number=None):
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in AS_OF_EXPORT_COLUMNS])
+
+    for state in register_as_of(when, serial_number=serial_number):
+        yield writer.writerow([
+            timezone.localtime(state[key]).strftime("%Y-%m-%d %H:%M") if key == "created_at" else state[key]
+            for _, key in AS_OF_EXPORT_COLUMNS
+        ])
+
+
+def register_as_of_response(when, day, serial_number=None):
+    response = StreamingHttpResponse(as_of_csv_lines(when, serial_number), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="assets_as_of_{day:%Y-%m-%d}.csv"'
+    return response
+
+
+def prune_checkpoints(keep):
+    """
+    Delete all but the newest keep finished checkpoints, and any unfinished
+    one older than the oldest kept (a copy that never completed)
+    """
+    kept = list(
+        RegisterCheckpoint.objects.filter(taken_at__isnull=False)
+        .order_by("-taken_at")
+        .values_list("pk", "started_at")[:keep]
+    )
+    if len(kept) < keep:
+        return 0
+
+    oldest_started = kept[-1][1]
+    stale = RegisterCheckpoint.objects.exclude(pk__in=[pk for pk, _ in kept]).filter(
+        started_at__lt=oldest_started
+    )
+    deleted, _ = stale.delete()
+    return deleted
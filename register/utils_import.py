@@ -0,0 +1,820 @@
+import csv
+import logging
+import os
+import secrets
+from collections import defaultdict
+from io import TextIOWrapper
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Asset, AuditLog, DataVersion, ImportBatch, ImportRow, is_active_status
+from .reference_data import reference
+from .signals import ASSET_DATA_VERSION, AUDIT_DATA_VERSION
+from .utils import TRACKED_FIELDS
+from .utils_audit import buffer_audit_entries, buffered_audit
+from .utils_jobs import enqueue_job, run_queued_jobs
+from .utils_pagination import keyset_values
+from .utils_search import sync_search_index
+
+logger = logging.getLogger(__name__)
+
+
+REQUIRED_HEADERS = {
+    "Device Name",
+    "Device Model",
+    "Serial Number",
+    "Device Type",
+    "Status",
+    "Location",
+    "Staff Name",
+}
+
+
+def open_csv(uploaded_file):
+    """
+    DictReader decoding an upload as it is read (a UTF-8 BOM is dropped),
+    straight from Django's in-memory or spooled temporary file, so the
+    whole file is never held in memory
+    """
+    uploaded_file.seek(0)
+    text = TextIOWrapper(uploaded_file.file, encoding="utf-8-sig", newline="")
+    return csv.DictReader(text)
+
+
+def missing_headers(fieldnames):
+    return REQUIRED_HEADERS - set(fieldnames or ())
+
+
+def reference_maps():
+    """
+    Case-insensitive {name: row} maps of the reference tables, built once
+    per import from the in-process registry
+    """
+    return {
+        "device_type": reference.device_types.name_map(),
+        "status": reference.statuses.name_map(),
+        "location": reference.locations.name_map(),
+        "department": reference.departments.name_map(),
+    }
+
+
+def clean_row(row):
+    """
+    The stripped CSV values under the keys the preview and import use
+    """
+    def value(header):
+        return (row.get(header) or "").strip()
+
+    return {
+        "device_name": value("Device Name"),
+        "device_model": value("Device Model"),
+        "serial_number": value("Serial Number"),
+        "device_type": value("Device Type"),
+        "status": value("Status"),
+        "location": value("Location"),
+        "department": value("Department"),
+        "staff_name": value("Staff Name"),
+    }
+
+
+def serial_errors(serial, serial_exists=False, duplicate_of=None, decommissioned=False):
+    """
+    The error messages for one row's serial_checks
+    """
+    errors = []
+
+    # Validate serial number uniqueness
+    if serial_exists:
+        errors.append(f"Serial number '{serial}' already exists in the system")
+    if decommissioned:
+        errors.append(f"Asset '{serial}' is decommissioned and cannot be updated by import")
+    if duplicate_of:
+        errors.append(f"Serial number '{serial}' is repeated in this file (first on row {duplicate_of})")
+
+    return errors
+
+
+def validate_row(values, maps, serial_exists=False, duplicate_of=None, decommissioned=False):
+    """
+    Row-level checks against the reference maps, without queries.
+    Returns the error messages, or [] after replacing each reference name
+    in values with its canonical spelling.
+    """
+    errors = serial_errors(values["serial_number"], serial_exists, duplicate_of, decommissioned)
+
+    # Validate device type
+    device_type = maps["device_type"].get(values["device_type"].lower())
+    if not device_type:
+        errors.append(f"Invalid device type '{values['device_type']}'")
+
+    # Validate status
+    status = maps["status"].get(values["status"].lower())
+    if not status:
+        errors.append(f"Invalid status '{values['status']}'")
+    elif status.name.lower() == "decommissioned":
+        errors.append("Cannot import assets with 'decommissioned' status")
+
+    # Validate location
+    location = maps["location"].get(values["location"].lower())
+    if not location:
+        errors.append(f"Invalid location '{values['location']}'")
+
+    # Validate department (optional)
+    department = None
+    if values["department"]:
+        department = maps["department"].get(values["department"].lower())
+        if not department:
+            errors.append(f"Invalid department '{values['department']}'")
+
+    if not errors:
+        values["device_type"] = device_type.name
+        values["status"] = status.name
+        values["location"] = location.name
+        values["department"] = department.name if department else ""
+
+    return errors
+
+
+def existing_serials(serials):
+    """
+    {serial_number: is_active} for those of these serial numbers that are
+    already registered (one query)
+    """
+    return dict(
+        Asset.objects.filter(serial_number__in=serials)
+        .values_list("serial_number", "is_active")
+    )
+
+
+def serial_checks(chunk, first_seen, upsert=False):
+    """
+    validate_row's serial number arguments for each (row_number, values)
+    of a chunk, from one serial_number__in query. first_seen maps each
+    serial to the row it first appeared on and is carried across chunks.
+    With upsert, a registered serial is an update rather than an error,
+    unless that asset is decommissioned.
+    """
+    existing = existing_serials({values["serial_number"] for _, values in chunk})
+    checks = []
+
+    for number, values in chunk:
+        serial = values["serial_number"]
+        duplicate_of = first_seen.setdefault(serial, number)
+        repeated = duplicate_of != number
+
+        checks.append({
+            # A repeat is only reported as repeated, whether or not an
+            # earlier chunk of this import has registered it by now
+            "serial_exists": serial in existing and not upsert and not repeated,
+            "duplicate_of": duplicate_of if repeated else None,
+            "decommissioned": upsert and existing.get(serial) is False,
+        })
+
+    return checks
+
+
+def validate_import(reader, chunk_size=None, start=2, upsert=False, first_seen=None):
+    """
+    Validate CSV rows in chunks, yielding (row_number, values, errors)
+    in file order. start is the row number of the first row read (the
+    header is row 1). A caller resuming part-way through a file passes
+    first_seen, {serial: row number}, for the rows before it.
+
+    Each chunk costs one serial_number__in query; reference names are
+    checked against in-memory maps and serials repeated within the file
+    are caught with a set.
+    """
+    chunk_size = chunk_size or getattr(settings, "IMPORT_CHUNK_SIZE", 1000)
+    maps = reference_maps()
+    first_seen = {} if first_seen is None else first_seen
+    rows = enumerate(reader, start=start)
+
+    while True:
+        chunk = [(number, clean_row(row)) for number, row in islice(rows, chunk_size)]
+        if not chunk:
+            return
+
+        for (number, values), checks in zip(chunk, serial_checks(chunk, first_seen, upsert)):
+            yield number, values, validate_row(values, maps, **checks)
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def asset_values(values, maps):
+    """
+    {Asset field: value} for a validated row, references resolved (None
+    for a name no longer in maps)
+    """
+    def resolve(field):
+        return maps[field].get(values[field].lower()) if values[field] else None
+
+    return {
+        "device_name": values["device_name"],
+        "device_model": values["device_model"],
+        "device_type": resolve("device_type"),
+        "status": resolve("status"),
+        "location": resolve("location"),
+        "department": resolve("department"),
+        "staff_name": values["staff_name"],
+    }
+
+
+def build_asset(values, maps):
+    return Asset(
+        serial_number=values["serial_number"],
+        is_active=True,  # decommissioned rows never pass validation
+        **asset_values(values, maps),
+    )
+
+
+def import_audit_entries(assets, user):
+    return [
+        AuditLog(
+            user=user,
+            asset=asset,
+            action="import",
+            field_name="asset",
+            old_value="",
+            new_value="Asset imported via CSV",
+        )
+        for asset in assets
+    ]
+
+
+def create_assets(rows, user, maps=None, batch_size=None):
+    """
+    Insert validated rows (clean_row dicts with canonical reference names)
+    with one bulk_create per IMPORT_BATCH_SIZE rows, and their "import"
+    audit entries in bulk (at the end of an enclosing buffered_audit()).
+    Returns the number of assets created.
+
+    Call inside a transaction; bulk inserts send no post_save, so the
+    search index is synced here and the data versions are bumped by the
+    querysets.
+    """
+    batch_size = batch_size or getattr(settings, "IMPORT_BATCH_SIZE", 500)
+    maps = maps or reference_maps()
+    created = 0
+
+    for batch in batches(rows, batch_size):
+        assets = Asset.objects.bulk_create([build_asset(values, maps) for values in batch])
+
+        # Backends without RETURNING leave pk unset
+        if any(asset.pk is None for asset in assets):
+            ids = dict(
+                Asset.objects.filter(serial_number__in=[a.serial_number for a in assets])
+                .values_list("serial_number", "pk")
+            )
+            for asset in assets:
+                asset.pk = ids[asset.serial_number]
+
+        buffer_audit_entries(import_audit_entries(assets, user))
+        sync_search_index(assets)
+        created += len(assets)
+
+    return created
+
+
+# ---------- Upsert ----------
+# Fields an upsert row may change, audited as the edit form audits them
+UPSERT_FIELDS = TRACKED_FIELDS
+
+REFERENCE_FIELDS = {
+    "device_type": reference.device_types,
+    "status": reference.statuses,
+    "location": reference.locations,
+    "department": reference.departments,
+}
+
+
+def asset_changes(asset, new_values):
+    """
+    [(field, old value, new value)] for the UPSERT_FIELDS a row changes,
+    compared in memory (references by id, blank text equal to None)
+    """
+    changes = []
+
+    for field in UPSERT_FIELDS:
+        new = new_values[field]
+
+        if field in REFERENCE_FIELDS:
+            old_id = getattr(asset, f"{field}_id")
+            if old_id == (new.pk if new else None):
+                continue
+            old = REFERENCE_FIELDS[field].get(old_id)
+        else:
+            old = getattr(asset, field)
+            if (old or "") == (new or ""):
+                continue
+
+        changes.append((field, old, new))
+
+    return changes
+
+
+def update_assets(rows, user, maps=None, batch_size=None):
+    """
+    Apply validated rows to the registered assets with their serial
+    numbers; decommissioned ones are left alone. Per IMPORT_BATCH_SIZE
+    rows: one query for the assets, one bulk_update per set of changed
+    fields (only those columns are written). "updated" audit entries worded like asset_update's are
+    written in bulk (at the end of an enclosing buffered_audit()).
+    Returns the number of assets changed.
+
+    Call inside a transaction.
+    """
+    batch_size = batch_size or getattr(settings, "IMPORT_BATCH_SIZE", 500)
+    maps = maps or reference_maps()
+    updated = 0
+
+    for batch in batches(rows, batch_size):
+        assets = Asset.objects.in_bulk(
+            [values["serial_number"] for values in batch], field_name="serial_number"
+        )
+        now = timezone.now()
+        groups = defaultdict(list)
+        entries = []
+
+        for values in batch:
+            asset = assets.get(values["serial_number"])
+            if asset is None:
+                continue
+            if not asset.is_active:
+                logger.warning("Skipped update of %s: the asset is decommissioned", values["serial_number"])
+                continue
+
+            new_values = asset_values(values, maps)
+            if None in (new_values["device_type"], new_values["status"], new_values["location"]):
+                logger.warning("Skipped update of %s: a reference no longer exists", values["serial_number"])
+                continue
+
+            changes = asset_changes(asset, new_values)
+            if not changes:
+                continue
+
+            fields = {field for field, _, _ in changes}
+            for field in fields:
+                setattr(asset, field, new_values[field])
+
+            # bulk_update skips auto_now and the is_active sync in save()
+            asset.updated_at = now
+            fields.add("updated_at")
+            if "status" in fields:
+                asset.is_active = is_active_status(asset.status_id)
+                fields.add("is_active")
+
+            groups[frozenset(fields)].append(asset)
+            entries.extend(
+                AuditLog(
+                    user=user,
+                    asset=asset,
+                    action="updated",
+                    field_name=field,
+                    old_value=str(old),
+                    new_value=str(new),
+                )
+                for field, old, new in changes
+            )
+
+        for fields, changed in groups.items():
+            Asset.objects.bulk_update(changed, sorted(fields))
+            if "staff_name" in fields:
+                sync_search_index(changed)
+            updated += len(changed)
+
+        buffer_audit_entries(entries)
+
+    return updated
+
+
+def upsert_assets(rows, user, maps=None, batch_size=None):
+    """
+    Update the rows whose serial number is registered and create the
+    rest. Returns (created, updated).
+    """
+    batch_size = batch_size or getattr(settings, "IMPORT_BATCH_SIZE", 500)
+    maps = maps or reference_maps()
+    created = updated = 0
+
+    for batch in batches(rows, batch_size):
+        existing = existing_serials({values["serial_number"] for values in batch})
+
+        updated += update_assets(
+            [values for values in batch if values["serial_number"] in existing], user, maps, batch_size
+        )
+        created += create_assets(
+            [values for values in batch if values["serial_number"] not in existing], user, maps, batch_size
+        )
+
+    return created, updated
+
+
+# ---------- Database staging ----------
+def staged_row(batch, number, values, errors, maps):
+    """
+    ImportRow for one validated CSV row; valid rows carry the resolved
+    reference ids so promotion needs no further lookups
+    """
+    row = ImportRow(
+        batch=batch,
+        row_number=number,
+        device_name=values["device_name"],
+        device_model=values["device_model"],
+        serial_number=values["serial_number"],
+        staff_name=values["staff_name"],
+        device_type_name=values["device_type"],
+        status_name=values["status"],
+        location_name=values["location"],
+        department_name=values["department"],
+        is_valid=not errors,
+        errors=errors,
+    )
+
+    if not errors:
+        row.device_type = maps["device_type"][values["device_type"].lower()]
+        row.status = maps["status"][values["status"].lower()]
+        row.location = maps["location"][values["location"].lower()]
+        if values["department"]:
+            row.department = maps["department"][values["department"].lower()]
+
+    return row
+
+
+def stage_import(reader, batch, batch_size=None):
+    """
+    Validate every CSV row and store it in ImportRow under batch, one
+    bulk_create per IMPORT_BATCH_SIZE rows. Only the batch id needs to
+    outlive the request. In an upsert batch, valid rows for registered
+    serials are linked to the asset they will update.
+    """
+    batch_size = batch_size or getattr(settings, "IMPORT_BATCH_SIZE", 500)
+    maps = reference_maps()
+
+    for chunk in batches(validate_import(reader, upsert=batch.upsert), batch_size):
+        rows = [staged_row(batch, number, values, errors, maps) for number, values, errors in chunk]
+
+        if batch.upsert:
+            asset_ids = dict(
+                Asset.objects.filter(serial_number__in=[row.serial_number for row in rows if row.is_valid])
+                .values_list("serial_number", "pk")
+            )
+            for row in rows:
+                if row.is_valid:
+                    row.asset_id = asset_ids.get(row.serial_number)
+
+        ImportRow.objects.bulk_create(rows)
+
+        batch.valid_rows += sum(row.is_valid for row in rows)
+        batch.error_rows += sum(not row.is_valid for row in rows)
+
+    batch.save(update_fields=["valid_rows", "error_rows"])
+    return batch
+
+
+def reject_registered_serials(batch):
+    """
+    Flag staged new-asset rows whose serial number was registered after
+    the preview, so promotion cannot hit the unique constraint
+    """
+    conflicts = list(
+        batch.rows.filter(
+            is_valid=True,
+            asset__isnull=True,
+            serial_number__in=Asset.objects.values("serial_number"),
+        )
+    )
+
+    for row in conflicts:
+        row.is_valid = False
+        row.errors = [f"Serial number '{row.serial_number}' already exists in the system"]
+
+    ImportRow.objects.bulk_update(conflicts, ["is_valid", "errors"])
+    return len(conflicts)
+
+
+def reject_decommissioned_assets(batch):
+    """
+    Flag staged upsert rows whose asset was decommissioned after the
+    preview, which validate_row would now reject
+    """
+    retired = list(batch.rows.filter(is_valid=True, asset__isnull=False, asset__is_active=False))
+
+    for row in retired:
+        row.is_valid = False
+        row.errors = [f"Asset '{row.serial_number}' is decommissioned and cannot be updated by import"]
+
+    ImportRow.objects.bulk_update(retired, ["is_valid", "errors"])
+    return len(retired)
+
+
+# Staged reference FK -> (its preview name column, label for errors)
+STAGED_REFERENCES = {
+    "device_type": ("device_type_name", "Device type"),
+    "status": ("status_name", "Status"),
+    "location": ("location_name", "Location"),
+    "department": ("department_name", "Department"),
+}
+
+
+def reject_stale_references(batch):
+    """
+    Flag valid staged rows whose resolved reference was deleted (the FK
+    was set to NULL) after the preview. Renamed references still resolve
+    by id and are promoted as they are now named.
+    """
+    missing = Q()
+    for field, (name_column, _) in STAGED_REFERENCES.items():
+        missing |= Q(**{f"{field}__isnull": True}) & ~Q(**{name_column: ""})
+
+    stale = list(batch.rows.filter(missing, is_valid=True))
+
+    for row in stale:
+        row.is_valid = False
+        row.errors = [
+            f"{label} '{getattr(row, name_column)}' no longer exists"
+            for field, (name_column, label) in STAGED_REFERENCES.items()
+            if getattr(row, f"{field}_id") is None and getattr(row, name_column)
+        ]
+
+    ImportRow.objects.bulk_update(stale, ["is_valid", "errors"])
+    return len(stale)
+
+
+def reject_changed_rows(batch):
+    """
+    Re-check the valid staged rows of batch against what changed since
+    the preview, moving the ones that no longer pass to its error rows.
+    Returns how many were rejected.
+    """
+    rejected = (
+        reject_registered_serials(batch)
+        + reject_decommissioned_assets(batch)
+        + reject_stale_references(batch)
+    )
+    if rejected:
+        batch.valid_rows -= rejected
+        batch.error_rows += rejected
+        batch.save(update_fields=["valid_rows", "error_rows"])
+    return rejected
+
+
+# ImportRow columns -> the clean_row keys update_assets reads. References
+# are read through the resolved FKs, so they carry their current names.
+STAGED_VALUE_COLUMNS = {
+    "device_name": "device_name",
+    "device_model": "device_model",
+    "serial_number": "serial_number",
+    "device_type": "device_type__name",
+    "status": "status__name",
+    "location": "location__name",
+    "department": "department__name",
+    "staff_name": "staff_name",
+}
+
+
+def staged_updates(batch):
+    """
+    clean_row dicts of the valid upsert rows of batch that match a
+    registered asset, read in keyset chunks
+    """
+    keys = list(STAGED_VALUE_COLUMNS)
+    rows = keyset_values(
+        batch.rows.filter(is_valid=True, asset__isnull=False, asset__is_active=True),
+        ("row_number", "id"),
+        list(STAGED_VALUE_COLUMNS.values()),
+    )
+    return ({key: value or "" for key, value in zip(keys, row)} for row in rows)
+
+
+def insert_staged_assets(batch, stamp):
+    """
+    INSERT ... SELECT the valid new-asset rows of batch into Asset, in a
+    savepoint so a unique violation leaves the transaction usable.
+    Returns the number of rows inserted.
+    """
+    qn = connection.ops.quote_name
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {qn(Asset._meta.db_table)} "
+            "(device_name, device_model, serial_number, staff_name, device_type_id, "
+            "status_id, location_id, department_id, is_active, created_at, updated_at) "
+            "SELECT device_name, device_model, serial_number, staff_name, device_type_id, "
+            "status_id, location_id, department_id, %s, %s, %s "
+            f"FROM {qn(ImportRow._meta.db_table)} WHERE batch_id = %s AND is_valid = %s AND asset_id IS NULL "
+            "ORDER BY row_number",
+            # decommissioned rows never pass validation
+            [True, stamp, stamp, batch.pk, True],
+        )
+        return cursor.rowcount
+
+
+def promote_batch(batch, user):
+    """
+    Copy the valid staged new-asset rows of batch into Asset, and their
+    "import" audit entries into AuditLog, with one INSERT ... SELECT each,
+    so the rows never travel through Python. Upsert rows matching a
+    registered asset are applied with update_assets. Returns
+    (created, updated).
+
+    Call inside a transaction, with the batch locked (select_for_update)
+    and still staged. Rows whose serial was registered, whose asset was
+    decommissioned or whose reference was deleted since the preview are
+    marked invalid first; a serial committed by another transaction after
+    that check is caught by the unique constraint, and the insert is
+    retried once without it. Raw inserts bypass the versioned querysets
+    and post_save, so the data versions are bumped and the search index
+    synced here.
+    """
+    qn = connection.ops.quote_name
+    asset_table = qn(Asset._meta.db_table)
+    audit_table = qn(AuditLog._meta.db_table)
+    staging_table = qn(ImportRow._meta.db_table)
+
+    stamp = connection.ops.adapt_datetimefield_value(timezone.now())
+    user_id = user.pk if user else None
+
+    reject_changed_rows(batch)
+
+    try:
+        created = insert_staged_assets(batch, stamp)
+    except IntegrityError:
+        reject_changed_rows(batch)
+        created = insert_staged_assets(batch, stamp)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {audit_table} "
+            "(asset_id, user_id, action, field_name, old_value, new_value, timestamp) "
+            "SELECT a.id, %s, %s, %s, %s, %s, %s "
+            f"FROM {staging_table} s INNER JOIN {asset_table} a ON a.serial_number = s.serial_number "
+            "WHERE s.batch_id = %s AND s.is_valid = %s AND s.asset_id IS NULL "
+            "ORDER BY s.row_number",
+            [user_id, "import", "asset", "", "Asset imported via CSV", stamp, batch.pk, True],
+        )
+
+    # Search index rows for the new assets, read back in keyset chunks
+    for chunk in batches(
+        keyset_values(
+            Asset.objects.filter(
+                serial_number__in=batch.rows.filter(is_valid=True, asset__isnull=True).values("serial_number")
+            ),
+            ("id",),
+            ("id", "serial_number", "staff_name"),
+        ),
+        getattr(settings, "IMPORT_BATCH_SIZE", 500),
+    ):
+        sync_search_index([Asset(pk=pk, serial_number=serial, staff_name=staff) for pk, serial, staff in chunk])
+
+    updated = update_assets(staged_updates(batch), user) if batch.upsert else 0
+
+    DataVersion.bump_on_commit(ASSET_DATA_VERSION)
+    DataVersion.bump_on_commit(AUDIT_DATA_VERSION)
+
+    batch.status = ImportBatch.STATUS_IMPORTED
+    batch.imported_rows = created
+    batch.updated_rows = updated
+    batch.imported_at = timezone.now()
+    batch.save(update_fields=["status", "imported_rows", "updated_rows", "imported_at"])
+
+    return created, updated
+
+
+# ---------- Background imports ----------
+class ImportClaimLost(Exception):
+    """
+    Another worker committed this job's progress first
+    """
+
+
+def save_upload(uploaded_file):
+    """
+    Copy an upload to IMPORT_ROOT under an unguessable name, returning it
+    """
+    os.makedirs(settings.IMPORT_ROOT, exist_ok=True)
+    stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+    name = f"import-{stamp}-{secrets.token_urlsafe(16)}.csv"
+
+    with open(os.path.join(settings.IMPORT_ROOT, name), "wb") as output:
+        for chunk in uploaded_file.chunks():
+            output.write(chunk)
+
+    return name
+
+
+def import_chunk(batch, chunk, maps):
+    """
+    Import one chunk of validated rows and advance the job's resume point
+    in the same transaction, so a chunk is either fully imported and
+    counted or not at all
+    """
+    valid = [values for _, values, errors in chunk if not errors]
+    failed = [staged_row(batch, number, values, errors, maps) for number, values, errors in chunk if errors]
+
+    with buffered_audit():
+        if batch.upsert:
+            created, updated = upsert_assets(valid, batch.created_by, maps)
+        else:
+            created, updated = create_assets(valid, batch.created_by, maps), 0
+        ImportRow.objects.bulk_create(failed)
+
+        progress = {
+            "rows_processed": batch.rows_processed + len(chunk),
+            "valid_rows": batch.valid_rows + len(valid),
+            "error_rows": batch.error_rows + len(failed),
+            "imported_rows": batch.imported_rows + created,
+            "updated_rows": batch.updated_rows + updated,
+            "heartbeat_at": timezone.now(),
+        }
+
+        # Guarded on the previous resume point: if a second worker resumed
+        # this job while we stalled, one of the two commits is rolled back
+        if not ImportBatch.objects.filter(
+            pk=batch.pk, rows_processed=batch.rows_processed
+        ).update(**progress):
+            raise ImportClaimLost(batch.pk)
+
+    for field, value in progress.items():
+        setattr(batch, field, value)
+
+
+def run_import_job(batch):
+    """
+    Import a claimed background job's file, skipping the rows_processed
+    rows already committed, one transaction per IMPORT_CHUNK_SIZE rows.
+    The upload is removed once the job finishes or fails.
+    """
+    chunk_size = getattr(settings, "IMPORT_CHUNK_SIZE", 1000)
+    maps = reference_maps()
+
+    try:
+        with open(batch.upload_path, "rb") as upload:
+            reader = csv.DictReader(TextIOWrapper(upload, encoding="utf-8-sig", newline=""))
+
+            missing = missing_headers(reader.fieldnames)
+            if missing:
+                raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+
+            # The serials of the rows already committed, so one repeated
+            # after the resume point is still reported as repeated
+            first_seen = {}
+            for number, row in enumerate(islice(reader, batch.rows_processed), start=2):
+                first_seen.setdefault(clean_row(row)["serial_number"], number)
+
+            results = validate_import(
+                reader,
+                chunk_size,
+                start=batch.rows_processed + 2,
+                upsert=batch.upsert,
+                first_seen=first_seen,
+            )
+
+            for chunk in batches(results, chunk_size):
+                import_chunk(batch, chunk, maps)
+
+    except ImportClaimLost:
+        logger.warning("Import job %s was resumed by another worker", batch.pk)
+        return batch
+
+    except Exception as exc:
+        logger.exception("Import job %s failed at row %s", batch.pk, batch.rows_processed + 2)
+
+        batch.status = ImportBatch.STATUS_FAILED
+        batch.error = "The CSV file must be UTF-8 encoded." if isinstance(exc, UnicodeDecodeError) else str(exc)
+    else:
+        batch.status = ImportBatch.STATUS_IMPORTED
+        batch.imported_at = timezone.now()
+
+    batch.finished_at = timezone.now()
+    batch.save(update_fields=["status", "error", "imported_at", "finished_at"])
+
+    if os.path.exists(batch.upload_path):
+        os.remove(batch.upload_path)
+
+    return batch
+
+
+def enqueue_import_job(batch):
+    """
+    Start the job once the request's transaction commits.
+
+    IMPORT_JOB_RUNNER = "thread" runs it in a background thread of the web
+    process; "worker" leaves it queued for manage.py run_import_jobs.
+    """
+    enqueue_job(batch, run_import_job, "IMPORT_JOB_RUNNER")
+
+
+def run_queued_import_jobs():
+    """
+    Run queued (or stalled) jobs until none are left. Returns how many
+    were run.
+    """
+    return run_queued_jobs(ImportBatch, run_import_job)
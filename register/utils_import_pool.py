@@ -0,0 +1,33 @@
+import pickle
+
+import django
+
+# Process pool workers for manage.py import_assets. Spawned processes
+# import this module before Django is set up, so nothing here may touch
+# the models at import time.
+
+_maps = None
+
+
+def init_worker(maps_pickle):
+    """
+    Pool initializer: set Django up, then keep the reference maps for
+    every chunk this process validates. They arrive pickled because model
+    instances can only be unpickled once the apps are loaded.
+    """
+    global _maps
+
+    django.setup()
+    _maps = pickle.loads(maps_pickle)
+
+
+def validate_chunk(chunk):
+    """
+    Pool task: validate_row's reference checks for each (row_number,
+    values) of a chunk. The serial checks need the database and the
+    writer's progress, so the parent adds them. Returns
+    [(row_number, values, errors)].
+    """
+    from .utils_import import validate_row
+
+    return [(number, values, validate_row(values, _maps)) for number, values in chunk]
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, transaction
+
+
+# Background job runner shared by export jobs (ExportJob) and background
+# imports (ImportBatch). A job model mixes in models_jobs.BackgroundJob;
+# run(job) does the work of a claimed job and records how it ended.
+
+
+def _run_in_thread(model, pk, run, then=None):
+    try:
+        job = model.objects.get(pk=pk)
+        if job.claim():
+            run(job)
+
+        # No worker command tidies up in this mode
+        if then is not None:
+            then()
+    finally:
+        connection.close()
+
+
+def enqueue_job(job, run, runner_setting, then=None):
+    """
+    Start the job once the request's transaction commits.
+
+    With the runner_setting setting at "thread" (the default) run(job) is
+    called in a background thread of the web process, followed by then();
+    "worker" leaves the job queued for its run_*_jobs command.
+    """
+    if getattr(settings, runner_setting, "thread") != "thread":
+        return
+
+    transaction.on_commit(
+        lambda: threading.Thread(
+            target=_run_in_thread, args=(type(job), job.pk, run, then), daemon=True
+        ).start()
+    )
+
+
+def run_queued_jobs(model, run):
+    """
+    Claim and run model.claimable() jobs, oldest first, until none are
+    left. Returns how many were run.
+    """
+    count = 0
+
+    while True:
+        close_old_connections()
+        job = model.claimable().order_by("created_at").first()
+        if job is None:
+            return count
+
+        if job.claim():
+            run(job)
+            count += 1
+
+
+class JobWorkerCommand(BaseCommand):
+    """
+    A run_*_jobs command: calls run_jobs() every --interval seconds (or
+    once with --once), printing the summary it returns when non-empty
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs queued now and exit instead of polling",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls when the queue is empty",
+        )
+
+    def run_jobs(self):
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        while True:
+            summary = self.run_jobs()
+
+            if summary:
+                self.stdout.write(summary)
+
+            if options["once"]:
+                return
+
+            time.sleep(options["interval"])
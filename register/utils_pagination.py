@@ -0,0 +1,398 @@
+import json
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connection
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .utils_cache import query_digest, versioned_cache_key
+
+
+# Public sort keys for the asset lists. Each one maps to an indexed column;
+# the primary key is always appended as a tiebreaker so the ordering is total.
+ASSET_SORT_FIELDS = {
+    "id": "id",
+    "updated_at": "updated_at",
+    "serial_number": "serial_number",
+    "device_name": "device_name",
+}
+
+DEFAULT_ASSET_SORT = "-id"
+
+CURSOR_SALT = "register.cursor"
+
+
+def normalize_sort(value, allowed=ASSET_SORT_FIELDS, default=DEFAULT_ASSET_SORT):
+    """
+    Return a valid sort key ("field" or "-field"), falling back to the default
+    """
+    if not value:
+        return default
+
+    field = value.lstrip("-")
+    if field not in allowed:
+        return default
+
+    return value
+
+
+def sort_ordering(sort, allowed=ASSET_SORT_FIELDS):
+    """
+    Translate a sort key into an order_by() tuple with the id tiebreaker
+    """
+    descending = sort.startswith("-")
+    field = allowed[sort.lstrip("-")]
+    prefix = "-" if descending else ""
+
+    if field == "id":
+        return (f"{prefix}id",)
+
+    return (f"{prefix}{field}", f"{prefix}id")
+
+
+def sort_toggles(sort, allowed=ASSET_SORT_FIELDS):
+    """
+    Map each sortable column to the sort key its header link should apply.
+    Clicking the active column flips its direction.
+    """
+    return {
+        field: f"-{field}" if sort == field else field
+        for field in allowed
+    }
+
+
+def keyset_condition(model, fields, values, forward=True):
+    """
+    The row-value comparison (a, b) > (x, y) for [(field, descending)]
+    fields, as nested OR/AND, which every backend can answer from a
+    composite index. forward=False gives the rows before the key instead.
+    """
+    condition = Q()
+    equal = Q()
+
+    opts = model._meta
+
+    for (field, descending), value in zip(fields, values):
+        value = opts.get_field(field).to_python(value)
+        lookup = "lt" if descending == forward else "gt"
+        condition |= equal & Q(**{f"{field}__{lookup}": value})
+        equal &= Q(**{field: value})
+
+    return condition
+
+
+def keyset_values(queryset, ordering, columns, chunk_size=2000):
+    """
+    Yield values_list tuples of columns for every row, in ordering, one
+    LIMIT chunk_size query per chunk seeking past the previous chunk's
+    last key. Unlike OFFSET or one long-lived cursor, each query costs the
+    same on a large table and no transaction stays open between chunks.
+
+    ordering must be total (end with the primary key); its fields are
+    fetched alongside columns and stripped from the yielded rows.
+    """
+    fields = [(o.lstrip("-"), o.startswith("-")) for o in ordering]
+    key_names = [field for field, _ in fields]
+    queryset = queryset.order_by(*ordering)
+    condition = Q()
+
+    while True:
+        rows = list(
+            queryset.filter(condition).values_list(*columns, *key_names)[:chunk_size]
+        )
+
+        for row in rows:
+            yield row[: len(columns)]
+
+        if len(rows) < chunk_size:
+            return
+
+        condition = keyset_condition(
+            queryset.model, fields, rows[-1][len(columns):], forward=True
+        )
+
+
+def _encode_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+class CursorPage:
+    """
+    One page of a keyset-paginated result.
+
+    Mirrors the parts of django.core.paginator.Page the templates use, minus
+    anything that needs a total count.
+    """
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset (seek) pagination over an ordered queryset.
+
+    Instead of OFFSET, each page remembers the sort key of its first and last
+    row in a signed, opaque token. The next page is fetched with
+    "WHERE (key, id) > (last_key, last_id) ORDER BY key, id LIMIT n", which
+    an index on (key, id) answers in the same time for page 1 and page 10,000.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+
+    @property
+    def _fields(self):
+        return [(o.lstrip("-"), o.startswith("-")) for o in self.ordering]
+
+    def _key(self, obj):
+        return [_encode_value(getattr(obj, field)) for field, _ in self._fields]
+
+    def encode_cursor(self, obj, direction):
+        return signing.dumps(
+            {"k": self._key(obj), "d": direction, "o": self.ordering},
+            salt=CURSOR_SALT,
+            compress=True,
+        )
+
+    def decode_cursor(self, token):
+        """
+        Return (values, direction) or None for a missing/invalid/stale token
+        """
+        if not token:
+            return None
+
+        try:
+            data = signing.loads(token, salt=CURSOR_SALT)
+        except signing.BadSignature:
+            return None
+
+        if tuple(data.get("o", ())) != self.ordering or data.get("d") not in ("n", "p"):
+            return None
+
+        return data["k"], data["d"]
+
+    def _rows(self, queryset, cursor):
+        """
+        Up to per_page + 1 rows of queryset past the cursor, in the order
+        they were fetched (reversed for a "previous" cursor)
+        """
+        limit = self.per_page + 1
+
+        if cursor is None:
+            return list(queryset.order_by(*self.ordering)[:limit])
+
+        values, direction = cursor
+        seek = keyset_condition(queryset.model, self._fields, values, forward=direction == "n")
+
+        if direction == "n":
+            return list(queryset.filter(seek).order_by(*self.ordering)[:limit])
+
+        reverse = [o[1:] if o.startswith("-") else f"-{o}" for o in self.ordering]
+        return list(queryset.filter(seek).order_by(*reverse)[:limit])
+
+    def _fetch(self, cursor):
+        return self._rows(self.queryset, cursor)
+
+    def get_page(self, token=None):
+        cursor = self.decode_cursor(token)
+        rows = self._fetch(cursor)
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if cursor is None:
+            return self._build_page(rows, has_more_after=has_more, has_more_before=False)
+
+        if cursor[1] == "n":
+            return self._build_page(rows, has_more_after=has_more, has_more_before=True)
+
+        rows.reverse()
+        return self._build_page(rows, has_more_after=True, has_more_before=has_more)
+
+    def _build_page(self, rows, has_more_after, has_more_before):
+        next_cursor = None
+        previous_cursor = None
+
+        if rows and has_more_after:
+            next_cursor = self.encode_cursor(rows[-1], "n")
+        if rows and has_more_before:
+            previous_cursor = self.encode_cursor(rows[0], "p")
+
+        return CursorPage(rows, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+
+class MergedCursorPaginator(CursorPaginator):
+    """
+    Keyset pagination over several querysets with the same key columns
+    (e.g. a table and its archive), read as one ordered result.
+
+    Each page takes per_page + 1 rows from every queryset past the cursor
+    and keeps the first per_page + 1 of their merge, so it costs one
+    indexed query per queryset. The ordering's fields must all sort the
+    same direction and be unique across the querysets.
+    """
+
+    def __init__(self, querysets, per_page, ordering):
+        super().__init__(querysets[0], per_page, ordering)
+        self.querysets = querysets
+
+        if len({descending for _, descending in self._fields}) > 1:
+            raise ValueError("MergedCursorPaginator needs a single sort direction")
+
+    def _fetch(self, cursor):
+        descending = self._fields[0][1]
+        # Rows come in ordering, or reversed for a "previous" cursor
+        if cursor is not None and cursor[1] == "p":
+            descending = not descending
+
+        rows = [row for queryset in self.querysets for row in self._rows(queryset, cursor)]
+        rows.sort(key=lambda row: [getattr(row, field) for field, _ in self._fields], reverse=descending)
+        return rows[: self.per_page + 1]
+
+
+class EstimatedPage(Page):
+    """
+    Page of an EstimatedCountPaginator whose total is only approximate.
+    Whether a next page exists comes from the rows actually fetched.
+    """
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids an exact COUNT(*) over large result sets.
+
+    A bounded count (COUNT over LIMIT PAGINATOR_EXACT_COUNT_LIMIT + 1 rows)
+    decides whether the result is small; small results are counted exactly.
+    Larger ones use the PostgreSQL planner estimate, or elsewhere a count
+    cached per query and invalidated through the model's DataVersion.
+    """
+
+    def __init__(self, object_list, per_page, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        limit = getattr(settings, "PAGINATOR_EXACT_COUNT_LIMIT", 1000)
+
+        bounded = queryset[: limit + 1].count()
+        if bounded <= limit:
+            return bounded
+
+        if connection.vendor == "postgresql":
+            estimate = planner_row_estimate(queryset)
+            if estimate is not None:
+                self.is_estimate = True
+                return max(estimate, bounded)
+
+        return cached_count(queryset)
+
+    def validate_number(self, number):
+        if not self.count or not self.is_estimate:
+            return super().validate_number(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_estimate:
+            return super().page(number)
+
+        # Fetch one extra row to know whether another page exists
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom: bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+
+        return EstimatedPage(
+            rows[: self.per_page], number, self, has_more=len(rows) > self.per_page
+        )
+
+    def get_page(self, number):
+        try:
+            return super().get_page(number)
+        except EmptyPage:
+            # Estimated totals can overshoot; fall back to the first page
+            return self.page(1)
+
+
+def planner_row_estimate(queryset):
+    """
+    PostgreSQL's estimated row count for a queryset, from EXPLAIN
+    """
+    try:
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def cached_count(queryset):
+    """
+    Exact count cached per query and model data version
+    """
+    key = versioned_cache_key("count", query_digest(queryset), models=[queryset.model])
+    return cache.get_or_set(
+        key,
+        queryset.count,
+        getattr(settings, "PAGINATOR_COUNT_CACHE_TIMEOUT", 600),
+    )
+
+
+def paginate_queryset(request, queryset, per_page, ordering):
+    """
+    Paginate an ordered queryset in the configured mode.
+
+    ASSET_LIST_PAGINATION = "cursor" switches the lists to keyset paging;
+    any request that already carries a cursor token stays in that mode.
+    """
+    mode = getattr(settings, "ASSET_LIST_PAGINATION", "page")
+
+    if mode == "cursor" or "cursor" in request.GET:
+        paginator = CursorPaginator(queryset, per_page, ordering)
+        return paginator.get_page(request.GET.get("cursor"))
+
+    paginator = EstimatedCountPaginator(queryset.order_by(*ordering), per_page)
+    return paginator.get_page(request.GET.get("page"))
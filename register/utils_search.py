@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+# Asset columns the list filters search by substring
+SEARCH_FIELDS = ("serial_number", "staff_name")
+
+# SQLite FTS5 shadow table maintained by the signals below
+FTS_TABLE = "register_asset_search"
+
+# Trigram indexes cannot help with shorter terms
+MIN_INDEXED_TERM_LENGTH = 3
+
+
+class IContainsSearchBackend:
+    """
+    Plain case-insensitive substring search (no index support)
+    """
+
+    def filter(self, queryset, field, term):
+        return queryset.filter(**{f"{field}__icontains": term})
+
+
+class TrigramSearchBackend(IContainsSearchBackend):
+    """
+    PostgreSQL backend.
+
+    Django compiles icontains to UPPER("col"::text) LIKE UPPER('%term%'),
+    which the pg_trgm GIN indexes on UPPER(col::text) created in migration
+    0021 answer directly, so the lookup itself stays unchanged.
+    """
+
+
+class FTS5SearchBackend(IContainsSearchBackend):
+    """
+    SQLite backend.
+
+    Narrows candidates through the FTS5 trigram shadow table, then re-applies
+    icontains on that small set so results match the plain lookup exactly.
+    """
+
+    def filter(self, queryset, field, term):
+        if field not in SEARCH_FIELDS or len(term) < MIN_INDEXED_TERM_LENGTH:
+            return super().filter(queryset, field, term)
+
+        phrase = '"%s"' % term.replace('"', '""')
+        candidates = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            [f"{field} : {phrase}"],
+        )
+
+        return super().filter(queryset.filter(id__in=candidates), field, term)
+
+
+_fts_available = None
+
+
+def fts_table_exists():
+    global _fts_available
+
+    if _fts_available is None:
+        _fts_available = (
+            connection.vendor == "sqlite"
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+
+    return _fts_available
+
+
+def get_search_backend():
+    """
+    Return the configured search backend instance.
+
+    ASSET_SEARCH_BACKEND may name a backend class by dotted path; otherwise
+    one is picked from the database vendor.
+    """
+    path = getattr(settings, "ASSET_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+
+    if connection.vendor == "postgresql":
+        return TrigramSearchBackend()
+
+    if fts_table_exists():
+        return FTS5SearchBackend()
+
+    return IContainsSearchBackend()
+
+
+def search_assets(queryset, field, term):
+    return get_search_backend().filter(queryset, field, term)
+
+
+# ---------- FTS5 shadow table sync ----------
+def sync_search_index(assets):
+    """
+    Write the searchable columns of the given assets to the FTS5 table
+    """
+    if not fts_table_exists():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, serial_number, staff_name) "
+            "VALUES (%s, %s, %s)",
+            [(a.pk, a.serial_number, a.staff_name) for a in assets],
+        )
+
+
+def remove_from_search_index(pks):
+    if not fts_table_exists():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+            [(pk,) for pk in pks],
+        )
+
+
+@receiver(post_save, sender="register.Asset")
+def asset_saved(sender, instance, **kwargs):
+    sync_search_index([instance])
+
+
+@receiver(post_delete, sender="register.Asset")
+def asset_deleted(sender, instance, **kwargs):
+    remove_from_search_index([instance.pk])
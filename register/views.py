@@ -1,17 +1,57 @@
-import csv
 from django.shortcuts import get_object_or_404, render, redirect
-from django.http import HttpResponse
-from .models import Asset, DeviceStatus, DeviceType, AuditLog, Department, Location
+from django.urls import reverse
+from django.http import FileResponse, Http404, JsonResponse
+from .models import Asset, ExportJob, ImportBatch
 from .forms import AssetForm
+from .reference_data import reference
 from django.db import transaction
 from django.contrib import messages
-from .utils import filter_assets, log_asset_action
+from .utils import (
+    TRACKED_FIELDS,
+    asset_facets,
+    cached_list_results,
+    facet_options,
+    filter_assets,
+    log_asset_action,
+    wants_fragment,
+)
 from django.core.paginator import Paginator
 from django.forms.models import model_to_dict
 from .utils import export_assets_to_csv
+from .utils_audit import (
+    asset_history_entries,
+    audit_log_response,
+    audit_page,
+    audit_sources,
+    buffered_audit,
+    parse_date,
+)
+from .utils_history import as_of_page, end_of_day, register_as_of_response
+from .utils_import import (
+    enqueue_import_job,
+    missing_headers,
+    open_csv,
+    promote_batch,
+    save_upload,
+    stage_import,
+)
+from .utils_exports import (
+    COLUMNAR_FORMATS,
+    EXPORT_FORMATS,
+    columnar_export_available,
+    enqueue_export_job,
+    export_file_response,
+    fail_stalled_exports,
+)
+from .utils_pagination import (
+    normalize_sort,
+    paginate_queryset,
+    sort_ordering,
+    sort_toggles,
+)
 from django.utils.timezone import now
-from io import TextIOWrapper
 from django.views.decorators.http import require_http_methods
+from django.views.decorators.vary import vary_on_headers
 from django.contrib.auth.decorators import login_required
 from .decorators import (
     can_create_asset, 
@@ -20,54 +60,57 @@ from .decorators import (
     can_import_assets,
     can_view_audit,
     admin_required,
-    manager_required
+    manager_required,
+    conditional_on_data,
 )
+from .reference_data import VERSION_KEY as REFERENCE_VERSION
+from .signals import ASSET_DATA_VERSION, AUDIT_DATA_VERSION
 
 
 # ---------- Asset List ----------
 @login_required
+@vary_on_headers("X-Requested-With")
 def asset(request):
-    serial_number = request.GET.get("serial_number")
-    device_status = request.GET.get("device_status")
-    device_type = request.GET.get("device_type")
-    staff_name = request.GET.get("staff_name")
-
     # Exclude decommissioned assets
-    try:
-        decommissioned_status = DeviceStatus.objects.get(name__iexact="decommissioned")
-    except DeviceStatus.DoesNotExist:
-        decommissioned_status = None
+    decommissioned_status = reference.decommissioned_status()
 
-    assets = Asset.objects.select_related(
+    assets = Asset.objects.active().select_related(
         "status", "device_type", "department", "location"
-    ).all()
-
-    if decommissioned_status:
-        assets = assets.exclude(status=decommissioned_status)
+    )
 
-    # Filters
-    if serial_number:
-        assets = assets.filter(serial_number__icontains=serial_number)
+    # Counts for the filter dropdowns
+    facets = asset_facets(request, assets)
+    sort = normalize_sort(request.GET.get("sort"))
 
-    if device_status:
-        assets = assets.filter(status_id=device_status)
+    def build():
+        # Filters, sorting and pagination (skipped on a cache hit)
+        page_obj = paginate_queryset(
+            request, filter_assets(request, assets), 10, sort_ordering(sort)
+        )
+        return {"assets": page_obj, "page_obj": page_obj}
 
-    if device_type:
-        assets = assets.filter(device_type_id=device_type)
+    results = cached_list_results(
+        request, "assets", "register/partials/asset_rows.html", build, Asset
+    )
 
-    if staff_name:
-        assets = assets.filter(staff_name__icontains=staff_name)
+    if wants_fragment(request):
+        return JsonResponse({**results, "facets": facets})
 
-    # Pagination
-    paginator = Paginator(assets, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    statuses = [
+        status for status in reference.statuses.all()
+        if status != decommissioned_status
+    ]
 
     return render(request, "register/asset.html", {
-        "assets": page_obj,
-        "statuses": DeviceStatus.objects.exclude(name__iexact="decommissioned"),
-        "device_types": DeviceType.objects.all(),
-        "page_obj": page_obj,
+        "results": results,
+        "statuses": statuses,
+        "device_types": reference.device_types.all(),
+        "status_facets": facet_options(statuses, facets["device_status"]),
+        "device_type_facets": facet_options(reference.device_types.all(), facets["device_type"]),
+        "location_facets": facet_options(reference.locations.all(), facets["location"]),
+        "department_facets": facet_options(reference.departments.all(), facets["department"]),
+        "sort": sort,
+        "sort_toggles": sort_toggles(sort),
     })
     
 
@@ -76,8 +119,8 @@ def asset_history(request, pk):
     # Get the asset
     asset = get_object_or_404(Asset, pk=pk)
     
-    # Get all audit log entries for this asset, ordered by timestamp
-    history = AuditLog.objects.filter(asset=asset).order_by("timestamp")
+    # Get all audit log entries for this asset (hot and archived), ordered by timestamp
+    history = asset_history_entries(asset)
     
     return render(request, "register/asset_history.html", {
         "history": history,
@@ -86,53 +129,42 @@ def asset_history(request, pk):
     
 
 @login_required
+@vary_on_headers("X-Requested-With")
 def decommissioned_assets(request):
-    try:
-        decommissioned_status = DeviceStatus.objects.get(name__iexact="decommissioned")
-    except DeviceStatus.DoesNotExist:
-        decommissioned_status = None
+    assets = Asset.objects.decommissioned().select_related(
+        "status", "device_type", "department", "location"
+    )
 
-    if decommissioned_status:
-        assets = Asset.objects.filter(status=decommissioned_status).select_related(
-            "status", "device_type", "department", "location"
-        )
-    else:
-        assets = Asset.objects.none()
+    sort = normalize_sort(request.GET.get("sort"))
 
-    # Filtering
-    serial_number = request.GET.get("serial_number")
-    device_type = request.GET.get("device_type")
-    staff_name = request.GET.get("staff_name")
+    def build():
+        # Filtering, sorting and pagination (skipped on a cache hit)
+        page_obj = paginate_queryset(
+            request, filter_assets(request, assets), 10, sort_ordering(sort)
+        )
+        return {"assets": page_obj, "page_obj": page_obj}
 
-    if serial_number:
-        assets = assets.filter(serial_number__icontains=serial_number)
-    if device_type:
-        assets = assets.filter(device_type_id=device_type)
-    if staff_name:
-        assets = assets.filter(staff_name__icontains=staff_name)
+    results = cached_list_results(
+        request, "decommissioned", "register/partials/decommissioned_rows.html", build, Asset
+    )
 
-    # Pagination
-    paginator = Paginator(assets, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    if wants_fragment(request):
+        return JsonResponse(results)
 
     return render(request, "register/decommissioned_assets.html", {
-        "assets": page_obj,
-        "statuses": DeviceStatus.objects.all(),
-        "device_types": DeviceType.objects.all(),
-        "page_obj": page_obj,
+        "results": results,
+        "statuses": reference.statuses.all(),
+        "device_types": reference.device_types.all(),
+        "sort": sort,
+        "sort_toggles": sort_toggles(sort),
     })
 
 
 @can_view_audit
 def audit_overview(request):
-    logs = AuditLog.objects.select_related("asset", "user").order_by("-timestamp")
-
-    # Optional filters (user, asset) can be added here later
-
-    paginator = Paginator(logs, 20)  # 20 entries per page
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    # Filters (user, asset/serial, action, field, dates) and keyset paging
+    # over the hot and archived entries
+    page_obj = audit_page(request, 20)  # 20 entries per page
 
     return render(request, "register/audit_overview.html", {
         "page_obj": page_obj
@@ -178,161 +210,152 @@ def import_assets(request):
             messages.error(request, "Please upload a valid CSV file.")
             return redirect("import_assets")
 
-        decoded = csv_file.read().decode("utf-8").splitlines()
-        reader = csv.DictReader(decoded)
-
-        required_headers = {
-            "Device Name",
-            "Device Model",
-            "Serial Number",
-            "Device Type",
-            "Status",
-            "Location",
-            "Staff Name",
-        }
-
-        if not required_headers.issubset(reader.fieldnames):
-            missing = required_headers - set(reader.fieldnames)
-            messages.error(
-                request,
-                f"Invalid CSV format. Missing required columns: {', '.join(missing)}. Use exported CSV as template."
-            )
+        reader = open_csv(csv_file)
+
+        try:
+            missing = missing_headers(reader.fieldnames)
+            if missing:
+                messages.error(
+                    request,
+                    f"Invalid CSV format. Missing required columns: {', '.join(missing)}. Use exported CSV as template."
+                )
+                return redirect("import_assets")
+
+            # Update assets whose serial number is already registered
+            upsert = request.POST.get("upsert") == "1"
+
+            if request.POST.get("mode") == "background":
+                # Imported chunk by chunk by a worker; no preview step
+                batch = ImportBatch.objects.create(
+                    file_name=csv_file.name,
+                    upload_name=save_upload(csv_file),
+                    upsert=upsert,
+                    status=ImportBatch.STATUS_QUEUED,
+                    created_by=request.user,
+                )
+                enqueue_import_job(batch)
+                return redirect("import_job", pk=batch.pk)
+
+            # Validated rows are staged in the database; the session only
+            # keeps the batch id
+            with transaction.atomic():
+                batch = ImportBatch.objects.create(
+                    file_name=csv_file.name,
+                    upsert=upsert,
+                    created_by=request.user,
+                )
+                stage_import(reader, batch)
+
+        except UnicodeDecodeError:
+            messages.error(request, "The CSV file must be UTF-8 encoded.")
             return redirect("import_assets")
 
-        valid_rows = []
-        error_rows = []
-
-        decommissioned_status = DeviceStatus.objects.filter(
-            name__iexact="decommissioned"
-        ).first()
-
-        for index, row in enumerate(reader, start=2):
-            row_errors = []
-            serial = row["Serial Number"].strip()
-
-            # Validate serial number uniqueness
-            if Asset.objects.filter(serial_number=serial).exists():
-                row_errors.append(f"Serial number '{serial}' already exists in the system")
-
-            # Validate device type
-            device_type = DeviceType.objects.filter(
-                name__iexact=row["Device Type"].strip()
-            ).first()
-            if not device_type:
-                row_errors.append(f"Invalid device type '{row['Device Type']}'")
-
-            # Validate status
-            status = DeviceStatus.objects.filter(
-                name__iexact=row["Status"].strip()
-            ).first()
-            if not status:
-                row_errors.append(f"Invalid status '{row['Status']}'")
-            elif decommissioned_status and status == decommissioned_status:
-                row_errors.append("Cannot import assets with 'decommissioned' status")
-
-            # Validate location
-            location = Location.objects.filter(
-                name__iexact=row["Location"].strip()
-            ).first()
-            if not location:
-                row_errors.append(f"Invalid location '{row['Location']}'")
-
-            # Validate department (optional)
-            department = None
-            dept_value = row.get("Department", "").strip()
-            if dept_value:
-                department = Department.objects.filter(
-                    name__iexact=dept_value
-                ).first()
-                if not department:
-                    row_errors.append(f"Invalid department '{dept_value}'")
-
-            # If there are errors, add to error_rows
-            if row_errors:
-                error_rows.append({
-                    "row_number": index,
-                    "device_name": row.get("Device Name", "").strip(),
-                    "device_model": row.get("Device Model", "").strip(),
-                    "serial_number": serial,
-                    "device_type": row.get("Device Type", "").strip(),
-                    "status": row.get("Status", "").strip(),
-                    "location": row.get("Location", "").strip(),
-                    "department": dept_value,
-                    "staff_name": row.get("Staff Name", "").strip(),
-                    "errors": row_errors,
-                })
-            else:
-                # No errors, add to valid rows
-                valid_rows.append({
-                    "row_number": index,
-                    "device_name": row["Device Name"].strip(),
-                    "device_model": row["Device Model"].strip(),
-                    "serial_number": serial,
-                    "device_type": device_type.name,
-                    "status": status.name,
-                    "location": location.name,
-                    "department": department.name if department else "",
-                    "staff_name": row["Staff Name"].strip(),
-                })
-
-        request.session["import_rows"] = valid_rows
-
-        return render(
-            request,
-            "register/import_preview.html",
-            {
-                "valid_rows": valid_rows,
-                "error_rows": error_rows,
-            }
-        )
+        ImportBatch.purge_stale()
+        request.session["import_batch"] = batch.pk
+
+        return redirect("import_preview")
 
     return render(request, "register/import_assets.html")
 
 
+def staged_import_batch(request):
+    """
+    The current user's unconfirmed import batch from the session, or None
+    """
+    batch_id = request.session.get("import_batch")
+    if not batch_id:
+        return None
+
+    return ImportBatch.objects.filter(
+        pk=batch_id,
+        created_by=request.user,
+        status=ImportBatch.STATUS_STAGED,
+    ).first()
+
+
+@can_import_assets
+def import_preview(request):
+    batch = staged_import_batch(request)
+
+    if batch is None:
+        messages.error(request, "No import data found.")
+        return redirect("import_assets")
+
+    # Valid and error rows page independently
+    valid_rows = Paginator(batch.rows.filter(is_valid=True).order_by("row_number"), 50)
+    error_rows = Paginator(batch.rows.filter(is_valid=False).order_by("row_number"), 50)
+
+    return render(
+        request,
+        "register/import_preview.html",
+        {
+            "batch": batch,
+            "update_rows": batch.rows.filter(is_valid=True, asset__isnull=False).count() if batch.upsert else 0,
+            "valid_page": valid_rows.get_page(request.GET.get("page")),
+            "error_page": error_rows.get_page(request.GET.get("error_page")),
+        }
+    )
+
+
+@can_import_assets
+def import_job(request, pk):
+    batch = get_object_or_404(ImportBatch, pk=pk, created_by=request.user)
+    return render(request, "register/import_job.html", {"batch": batch})
+
+
+@can_import_assets
+def import_job_status(request, pk):
+    batch = get_object_or_404(ImportBatch, pk=pk, created_by=request.user)
+
+    # A thread-run job dies with its web process, and a job queued before
+    # a restart has no thread at all; the next poll (re)starts either.
+    # claim() lets only one thread have it.
+    if ImportBatch.claimable().filter(pk=pk).exists():
+        enqueue_import_job(batch)
+
+    return JsonResponse(batch.as_dict())
+
+
 @can_import_assets
 def confirm_import(request):
-    rows = request.session.get("import_rows")
+    batch = staged_import_batch(request)
 
-    if not rows:
+    if batch is None:
         messages.error(request, "No import data found.")
         return redirect("import_assets")
 
-    assets = []
-
-    with transaction.atomic():
-        for row in rows:
-            # Get department if provided
-            department = None
-            if row.get("department"):
-                department = Department.objects.get(name=row["department"])
-
-            asset = Asset.objects.create(
-                device_name=row["device_name"],
-                device_model=row["device_model"],
-                serial_number=row["serial_number"],
-                device_type=DeviceType.objects.get(name=row["device_type"]),
-                status=DeviceStatus.objects.get(name=row["status"]),
-                location=Location.objects.get(name=row["location"]),
-                department=department,
-                staff_name=row["staff_name"],
-            )
+    with buffered_audit():
+        # A repeated POST waits on this lock, then finds the batch imported
+        batch = (
+            ImportBatch.objects.select_for_update()
+            .filter(pk=batch.pk, status=ImportBatch.STATUS_STAGED)
+            .first()
+        )
+        if batch is not None:
+            previewed = batch.valid_rows
+            created, updated = promote_batch(batch, request.user)
 
-            log_asset_action(
-                user=request.user,
-                asset=asset,
-                action="import",
-                field_name="asset",
-                old_value="",
-                new_value="Asset imported via CSV"
-            )
+    request.session.pop("import_batch", None)
 
-            assets.append(asset)
+    if batch is None:
+        messages.error(request, "This import has already been confirmed.")
+        return redirect("import_assets")
 
-    del request.session["import_rows"]
+    if batch.valid_rows < previewed:
+        messages.warning(
+            request,
+            f"{previewed - batch.valid_rows} rows were skipped because the register "
+            "changed since the preview.",
+        )
 
-    messages.success(
-        request, f"{len(assets)} assets imported successfully."
-    )
+    if batch.upsert:
+        messages.success(
+            request, f"{created} assets imported and {updated} updated successfully."
+        )
+    else:
+        messages.success(
+            request, f"{created} assets imported successfully."
+        )
 
     return redirect("asset_list")
 
@@ -346,30 +369,24 @@ def asset_update(request, pk):
         form = AssetForm(request.POST, instance=asset)
 
         if form.is_valid():
-            updated_asset = form.save()
-
-            tracked_fields = [
-                "device_name",
-                "device_model",
-                "status",
-                "location",
-                "department",
-                "staff_name",
-            ]
-
-            for field in tracked_fields:
-                old_value = getattr(old_asset, field)
-                new_value = getattr(updated_asset, field)
-
-                if old_value != new_value:
-                    log_asset_action(
-                        user=request.user,
-                        asset=updated_asset,
-                        action="updated",
-                        field_name=field,
-                        old_value=str(old_value),
-                        new_value=str(new_value)
-                    )
+            # One transaction: the per-field audit entries are written
+            # together at its end
+            with buffered_audit():
+                updated_asset = form.save()
+
+                for field in TRACKED_FIELDS:
+                    old_value = getattr(old_asset, field)
+                    new_value = getattr(updated_asset, field)
+
+                    if old_value != new_value:
+                        log_asset_action(
+                            user=request.user,
+                            asset=updated_asset,
+                            action="updated",
+                            field_name=field,
+                            old_value=str(old_value),
+                            new_value=str(new_value)
+                        )
 
             messages.success(request, "Asset updated successfully.")
             return redirect("asset_list")
@@ -385,46 +402,128 @@ def asset_update(request, pk):
 
 # ---------- CSV Export ----------
 @login_required
+@conditional_on_data(ASSET_DATA_VERSION, REFERENCE_VERSION)
 def export_assets_csv(request):
-    assets = Asset.objects.exclude(
-        status__name__iexact="decommissioned"
-    )
+    assets = Asset.objects.active()
 
     assets = filter_assets(request, assets)
 
-    return export_assets_to_csv(assets)
+    return export_assets_as(request, assets, "assets")
 
 
 @login_required
+@conditional_on_data(ASSET_DATA_VERSION, REFERENCE_VERSION)
 def export_decommissioned_assets_csv(request):
-    try:
-        decommissioned_status = DeviceStatus.objects.get(
-            name__iexact="decommissioned"
-        )
-    except DeviceStatus.DoesNotExist:
-        return export_assets_to_csv(Asset.objects.none())
+    assets = Asset.objects.decommissioned()
+
+    # The list's filters, as the background export job applies them
+    assets = filter_assets(request, assets)
+
+    return export_assets_as(request, assets, "decommissioned_assets")
+
+
+def export_assets_as(request, assets, basename):
+    """
+    CSV by default; ?format=xlsx, parquet or arrow for the other formats
+    """
+    export_format = request.GET.get("format", "csv")
+
+    if export_format not in EXPORT_FORMATS:
+        return export_assets_to_csv(assets)
+
+    if export_format in COLUMNAR_FORMATS and not columnar_export_available():
+        messages.error(request, "Parquet and Arrow exports need the pyarrow package installed.")
+        return redirect("asset_list")
+
+    return export_file_response(assets, export_format, basename)
+
+
+# ---------- Background Export ----------
+@login_required
+@require_http_methods(["POST"])
+def start_export_job(request, kind):
+    job = ExportJob.objects.create(
+        kind=kind,
+        params=dict(request.GET.lists()),
+        requested_by=request.user,
+    )
+    enqueue_export_job(job)
 
-    assets = Asset.objects.filter(
-        status=decommissioned_status
-    ).select_related(
-        "device_type", "status", "location", "department"
+    return JsonResponse(
+        {**job.as_dict(), "status_url": reverse("export_job_status", args=[job.pk])},
+        status=202,
     )
 
-    return export_assets_to_csv(assets)
 
+@login_required
+def export_job_status(request, pk):
+    job = get_object_or_404(ExportJob, pk=pk, requested_by=request.user)
 
-@can_view_audit
-def system_history(request):
-    logs = (
-        AuditLog.objects
-        .select_related("user", "asset")
-        .order_by("-timestamp")
+    # A thread-run job dies with its web process; report it as failed
+    if fail_stalled_exports(ExportJob.stalled().filter(pk=pk)):
+        job.refresh_from_db()
+
+    return JsonResponse(job.as_dict())
+
+
+@login_required
+def export_job_download(request, pk):
+    job = get_object_or_404(
+        ExportJob, pk=pk, requested_by=request.user, status=ExportJob.STATUS_DONE
+    )
+    try:
+        export_file = open(job.path, "rb")
+    except FileNotFoundError:
+        raise Http404("This export has expired.")
+
+    return FileResponse(
+        export_file,
+        as_attachment=True,
+        filename=job.file_name,
+        content_type="application/gzip",
     )
 
-    paginator = Paginator(logs, 20)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+
+@can_view_audit
+def system_history(request):
+    page_obj = audit_page(request, 20)
 
     return render(request, "register/system_history.html", {
         "page_obj": page_obj
     })
+
+
+@can_view_audit
+@conditional_on_data(AUDIT_DATA_VERSION)
+def export_audit_log(request):
+    return audit_log_response(audit_sources(request.GET), request.GET.get("format", "csv"))
+
+
+@can_view_audit
+def register_as_of(request):
+    """
+    The register as it stood at the end of a given day, rebuilt from the
+    nearest later checkpoint and the audit log
+    """
+    day = parse_date(request.GET.get("date"))
+    serial_number = request.GET.get("serial_number", "").strip()
+    page_obj = None
+
+    if day is not None:
+        page_obj = as_of_page(end_of_day(day), 50, request.GET.get("cursor"), serial_number)
+
+    return render(request, "register/register_as_of.html", {
+        "day": day,
+        "page_obj": page_obj,
+    })
+
+
+@can_view_audit
+def export_register_as_of(request):
+    day = parse_date(request.GET.get("date"))
+    if day is None:
+        messages.error(request, "Choose a date to export the register as of.")
+        return redirect("register_as_of")
+
+    serial_number = request.GET.get("serial_number", "").strip()
+    return register_as_of_response(end_of_day(day), day, serial_number)
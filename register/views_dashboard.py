@@ -2,7 +2,9 @@ from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
-from .decorators import admin_required, manager_required
+from .decorators import admin_required, manager_required, conditional_on_data
+from .reference_data import VERSION_KEY as REFERENCE_VERSION
+from .signals import ASSET_DATA_VERSION, AUDIT_DATA_VERSION
 from .utils_dashboard import (
     get_dashboard_stats,
     get_trend_data,
@@ -57,6 +59,7 @@ def analytics(request):
 
 @login_required
 @require_http_methods(["GET"])
+@conditional_on_data(ASSET_DATA_VERSION, AUDIT_DATA_VERSION, REFERENCE_VERSION, daily=True)
 def api_dashboard_stats(request):
     """
     API endpoint for dashboard statistics (for AJAX updates)
@@ -67,6 +70,7 @@ def api_dashboard_stats(request):
 
 @login_required
 @require_http_methods(["GET"])
+@conditional_on_data(ASSET_DATA_VERSION, REFERENCE_VERSION, daily=True)
 def api_chart_data(request):
     """
     API endpoint for chart data
@@ -206,6 +210,7 @@ def generate_metrics(request):
 
 
 @login_required
+@conditional_on_data(ASSET_DATA_VERSION, AUDIT_DATA_VERSION, REFERENCE_VERSION, daily=True)
 def export_dashboard_json(request):
     """
     Export complete dashboard data as JSON